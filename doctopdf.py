@@ -4,13 +4,13 @@
 
 #doc格式转成pdf
 import sys, os
-from win32com.client import Dispatch, constants, gencache
 from optparse import OptionParser
 
 # def usage():
 #     sys.stderr.write ("doc2pdf.py -i input -o [output]")
 #     sys.exit(2)
 def doc2pdf(input, output):
+  from win32com.client import Dispatch, constants
   w = Dispatch("Word.Application")
   try:
     doc = w.Documents.Open(input, ReadOnly = 1)
@@ -25,7 +25,12 @@ def doc2pdf(input, output):
 def GenerateSupport():
   # enable python COM support for Word 2007
   # this is generated by: makepy.py -i "Microsoft Word 12.0 Object Library"
+  from win32com.client import gencache
   gencache.EnsureModule('{00020905-0000-0000-C000-000000000046}', 0, 8, 4)
+def convert(input, output):
+    #Word 需要绝对路径
+    GenerateSupport()
+    return doc2pdf(os.path.abspath(input), os.path.abspath(output))
 def main():
     input=options.input
     output=options.output
@@ -45,10 +50,9 @@ def main():
   # if (not os.path.isabs(output)):
   #   output = os.path.abspath(output)
     try:
-        GenerateSupport()
         # rc = doc2pdf(input, output)
         # return rc
-        doc2pdf(input,output)
+        convert(input,output)
         return
     except:
         return -1
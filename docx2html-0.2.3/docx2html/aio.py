@@ -0,0 +1,202 @@
+"""
+Conversion from asyncio code.
+
+``convert_async`` takes the same arguments as ``convert`` and returns a
+future with the html. The document is parsed and rendered on an executor so
+the event loop is not blocked, and the image handler may return awaitables
+(a coroutine, a future or a task) instead of the ``src``. Those are awaited
+concurrently, at most ``concurrency`` at a time, and their results filled
+into the ``src`` attributes once they are all resolved::
+
+    async def upload(image_id, relationship_dict):
+        return await storage.put(relationship_dict[image_id])
+
+    html = await convert_async('path/to/docx/file', image_handler=upload)
+
+The image handler is called once per image id, on the event loop thread.
+
+On python 2 this needs ``trollius``.
+"""
+import functools
+import re
+import uuid
+
+try:
+    import asyncio
+except ImportError:
+    try:
+        import trollius as asyncio
+    except ImportError:
+        asyncio = None
+
+from docx2html.core import _fill_img_tag, convert
+
+DEFAULT_CONCURRENCY = 10
+
+
+def _is_awaitable(value):
+    return (
+        asyncio.iscoroutine(value) or
+        isinstance(value, asyncio.Future) or
+        hasattr(value, '__await__')
+    )
+
+
+class _Placeholders(object):
+    """
+    An image handler that records the image ids and puts a placeholder in
+    the ``src``, to be replaced once the real ``src`` is known.
+    """
+    def __init__(self):
+        self.token = uuid.uuid4().hex
+        self.image_ids = []
+        self.relationship_dict = {}
+
+    def image_handler(self, image_id, relationship_dict):
+        self.relationship_dict = relationship_dict
+        if image_id not in self.image_ids:
+            self.image_ids.append(image_id)
+        return 'docx2html-%s-%d' % (
+            self.token,
+            self.image_ids.index(image_id),
+        )
+
+    def fill(self, html, srcs):
+        # The whole img tag is written again, the src the way convert does.
+        regex = re.compile(
+            r'<img src="docx2html-%s-(\d+)"([^>]*?) />' % self.token,
+        )
+        return regex.sub(
+            lambda match: _fill_img_tag(
+                srcs[int(match.group(1))],
+                match.group(2),
+            ),
+            html,
+        )
+
+
+def _chain_failure(source, destination):
+    """
+    Pass a cancellation or an exception of ``source`` on to ``destination``.
+    Returns True if there was one.
+    """
+    if destination.done():
+        return True
+    if source.cancelled():
+        destination.cancel()
+        return True
+    if source.exception() is not None:
+        destination.set_exception(source.exception())
+        return True
+    return False
+
+
+def _gather_limited(loop, calls, limit):
+    """
+    Call every callable in ``calls`` and return a future with their results,
+    in order. Results that are awaitable are awaited with at most ``limit``
+    of them pending at a time. The first failure cancels the rest.
+    """
+    done = asyncio.Future(loop=loop)
+    results = [None] * len(calls)
+    queue = list(enumerate(calls))
+    queue.reverse()
+    running = set()
+
+    def fail(exception):
+        for task in running:
+            task.cancel()
+        if not done.done():
+            done.set_exception(exception)
+
+    def finished(index, task):
+        running.discard(task)
+        if done.done():
+            return
+        if task.cancelled():
+            done.cancel()
+        elif task.exception() is not None:
+            fail(task.exception())
+        else:
+            results[index] = task.result()
+            start_next()
+
+    def start_next():
+        while queue and len(running) < limit:
+            index, call = queue.pop()
+            try:
+                value = call()
+            except Exception as e:
+                fail(e)
+                return
+            if not _is_awaitable(value):
+                results[index] = value
+                continue
+            task = asyncio.ensure_future(value, loop=loop)
+            running.add(task)
+            task.add_done_callback(functools.partial(finished, index))
+        if not queue and not running and not done.done():
+            done.set_result(results)
+
+    start_next()
+    return done
+
+
+def convert_async(
+        file_path,
+        image_handler=None,
+        fall_back=None,
+        converter=None,
+        concurrency=DEFAULT_CONCURRENCY,
+        executor=None,
+        loop=None):
+    """
+    ``file_path``, ``image_handler``, ``fall_back`` and ``converter`` are the
+        same as for ``convert``, except that ``image_handler`` may return an
+        awaitable.
+    ``concurrency`` is the most awaitables from the image handler that are
+        pending at a time.
+    ``executor`` is the executor the document is parsed and rendered on, the
+        default executor of the loop is used if it is None.
+
+    Returns a future with the html extracted from ``file_path``
+    """
+    if asyncio is None:
+        raise ImportError('convert_async needs asyncio (or trollius).')
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1.')
+    if loop is None:
+        loop = asyncio.get_event_loop()
+
+    result = asyncio.Future(loop=loop)
+    placeholders = _Placeholders()
+    rendering = loop.run_in_executor(executor, functools.partial(
+        convert,
+        file_path,
+        image_handler=placeholders.image_handler if image_handler else None,
+        fall_back=fall_back,
+        converter=converter,
+    ))
+
+    def resolved(html, resolving):
+        if _chain_failure(resolving, result):
+            return
+        result.set_result(placeholders.fill(html, resolving.result()))
+
+    def rendered(rendering):
+        if _chain_failure(rendering, result):
+            return
+        html = rendering.result()
+        calls = [
+            functools.partial(
+                image_handler,
+                image_id,
+                placeholders.relationship_dict,
+            )
+            for image_id in placeholders.image_ids
+        ]
+        resolving = _gather_limited(loop, calls, concurrency)
+        resolving.add_done_callback(functools.partial(resolved, html))
+
+    rendering.add_done_callback(rendered)
+    return result
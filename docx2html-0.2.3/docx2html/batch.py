@@ -0,0 +1,353 @@
+"""
+Converting many documents.
+
+``convert_pipelined`` converts a list of files of any format. Files that are
+not docx are converted to docx on ``converter_workers`` threads, at most
+``queue_size`` files ahead of the parsing, while the documents that are
+already docx are parsed and rendered. The external converters and the parser
+are busy at the same time instead of waiting on each other::
+
+    with ConverterPool(AbiwordBackend(), workers=2) as pool:
+        for result in convert_pipelined(file_paths, converter=pool.convert):
+            if result.error is None:
+                save(result.file_path, result.html)
+
+The results come in the same order as ``file_paths``, a file that fails
+does not stop the others.
+
+``convert_scheduled`` converts the files on worker processes, shortest job
+first, so that a few huge documents do not hold up every small one behind
+them. The cost of each file is estimated by ``get_profile`` from the zip
+directory alone (nothing is decompressed), and files that are estimated to
+take more than ``big_cost`` seconds go to a lane of their own::
+
+    for result in convert_scheduled(file_paths, workers=4, big_workers=1):
+        ...
+
+Its results come as the files are done. Pass ``limits`` (see
+``docx2html.limits``) to convert documents from untrusted sources, a file
+that goes over a limit fails with ``LimitExceeded`` (or ``MemoryError``)
+without stopping its worker.
+"""
+import errno
+import os
+import pickle
+from collections import deque, namedtuple
+from zipfile import ZipFile, BadZipfile
+
+from docx2html.core import convert, replace_ext
+from docx2html.exceptions import ConversionFailed
+from docx2html.limits import Limits, convert_limited, set_memory_limit
+
+DEFAULT_QUEUE_SIZE = 4
+DEFAULT_CONVERTER_WORKERS = 2
+DEFAULT_WORKERS = 2
+DEFAULT_BIG_WORKERS = 1
+
+# Rough seconds per byte of document.xml, per image and per byte of media,
+# measured with the benchmark documents.
+DOCUMENT_BYTE_COST = 3e-6
+IMAGE_COST = 5e-4
+MEDIA_BYTE_COST = 2e-8
+# Files estimated to take longer than this many seconds go to the big lane.
+BIG_DOCUMENT_COST = 5.0
+# Seconds between checks on the jobs of ``convert_scheduled``.
+POLL_INTERVAL = 0.05
+
+BatchResult = namedtuple('BatchResult', ['file_path', 'html', 'error'])
+
+# What ``get_profile`` finds out about a file without converting it.
+Profile = namedtuple(
+    'Profile',
+    [
+        'file_path',
+        'document_bytes',
+        'media_count',
+        'media_bytes',
+        'parts',
+        'cost',
+    ],
+)
+
+
+class _Done(object):
+    # The same interface as the results of ``ThreadPool.apply_async``.
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def _needs_converter(file_path):
+    _, extension = os.path.splitext(file_path)
+    return extension not in ('.docx', '.html', '.htm')
+
+
+def _convert_to_docx(converter, file_path):
+    docx_path = replace_ext(file_path, '.docx')
+    converter(docx_path, file_path)
+    return docx_path
+
+
+def _render(file_path, docx_path, fall_back, kwargs):
+    if not os.path.isfile(docx_path):
+        if fall_back is None:
+            raise ConversionFailed('Conversion to docx failed.')
+        return fall_back(file_path)
+    return convert(docx_path, **kwargs)
+
+
+def convert_pipelined(
+        file_paths,
+        converter=None,
+        fall_back=None,
+        queue_size=DEFAULT_QUEUE_SIZE,
+        converter_workers=DEFAULT_CONVERTER_WORKERS,
+        **kwargs):
+    """
+    ``file_paths`` are the files to convert.
+    ``converter`` and ``fall_back`` are the same as for ``convert``.
+    ``queue_size`` is how many files may be converted to docx ahead of the
+        one that is being parsed.
+    ``converter_workers`` is how many files are converted to docx at a
+        time.
+    The other keyword arguments are passed on to ``convert``.
+
+    Yields a ``BatchResult`` for every file, in order, with the html or the
+    exception the file failed with.
+    """
+    if queue_size < 1:
+        raise ValueError('queue_size must be at least 1.')
+    pool = None
+    pending = deque()
+    file_paths = iter(file_paths)
+    try:
+        while True:
+            # Keep the conversion stage up to ``queue_size`` files ahead.
+            for file_path in file_paths:
+                if converter is not None and _needs_converter(file_path):
+                    if pool is None:
+                        # Only import it when it is used.
+                        from multiprocessing.pool import ThreadPool
+                        pool = ThreadPool(converter_workers)
+                    docx_path = pool.apply_async(
+                        _convert_to_docx,
+                        (converter, file_path),
+                    )
+                else:
+                    docx_path = _Done(file_path)
+                pending.append((file_path, docx_path))
+                if len(pending) > queue_size:
+                    break
+            if not pending:
+                return
+            file_path, docx_path = pending.popleft()
+            try:
+                html = _render(file_path, docx_path.get(), fall_back, kwargs)
+            except Exception as e:
+                yield BatchResult(file_path, None, e)
+            else:
+                yield BatchResult(file_path, html, None)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+###
+# Scheduling
+###
+
+
+def get_profile(file_path):
+    """
+    Return the ``Profile`` of ``file_path`` from the directory of the zip
+    file, with the estimated seconds it takes to convert as the ``cost``.
+    The size of a file that is not a docx is taken as its document size.
+    """
+    try:
+        zf = ZipFile(file_path)
+    except (BadZipfile, IOError, OSError):
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = 0
+        return Profile(file_path, size, 0, 0, [], size * DOCUMENT_BYTE_COST)
+    document_bytes = 0
+    media_count = 0
+    media_bytes = 0
+    parts = []
+    for item in zf.infolist():
+        parts.append(item.filename)
+        if item.filename == 'word/document.xml':
+            document_bytes = item.file_size
+        elif item.filename.startswith('word/media/'):
+            media_count += 1
+            media_bytes += item.file_size
+    zf.close()
+    cost = (
+        document_bytes * DOCUMENT_BYTE_COST +
+        media_count * IMAGE_COST +
+        media_bytes * MEDIA_BYTE_COST
+    )
+    return Profile(
+        file_path,
+        document_bytes,
+        media_count,
+        media_bytes,
+        parts,
+        cost,
+    )
+
+
+def schedule(profiles, big_cost=BIG_DOCUMENT_COST):
+    """
+    Split ``profiles`` into the small and the big ones (those that cost more
+    than ``big_cost``), each ordered from the cheapest to the most
+    expensive.
+    """
+    ordered = sorted(profiles, key=lambda profile: profile.cost)
+    small = [profile for profile in ordered if profile.cost <= big_cost]
+    big = [profile for profile in ordered if profile.cost > big_cost]
+    return small, big
+
+
+# The queue the jobs of a worker process say which process they run on.
+_started = None
+
+
+def _init_worker(started, max_memory):
+    global _started
+    _started = started
+    set_memory_limit(max_memory)
+
+
+def _convert_job(index, file_path, limits, converter, fall_back, kwargs):
+    # Runs on a worker process, everything it returns has to be pickled.
+    if _started is not None:
+        _started.put((index, os.getpid()))
+    try:
+        html = convert_limited(
+            file_path,
+            limits,
+            converter=converter,
+            fall_back=fall_back,
+            **kwargs
+        )
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+        except Exception:
+            e = Exception('%s: %s' % (e.__class__.__name__, e))
+        return BatchResult(file_path, None, e)
+    return BatchResult(file_path, html, None)
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno != errno.ESRCH
+    return True
+
+
+def convert_scheduled(
+        file_paths,
+        workers=DEFAULT_WORKERS,
+        big_workers=DEFAULT_BIG_WORKERS,
+        big_cost=BIG_DOCUMENT_COST,
+        converter=None,
+        fall_back=None,
+        limits=None,
+        **kwargs):
+    """
+    ``file_paths`` are the files to convert.
+    ``workers`` is how many processes convert the small files.
+    ``big_workers`` is how many processes convert the files that are
+        estimated to take longer than ``big_cost`` seconds.
+    ``limits`` are the ``Limits`` every file is converted within.
+    ``converter`` and ``fall_back`` are the same as for ``convert`` and the
+        other keyword arguments are passed on to ``convert``. They are sent
+        to the worker processes, so they have to be picklable (functions
+        defined at the top level of a module).
+
+    Yields a ``BatchResult`` for every file as it is done. A file that could
+    not be sent to a worker, or whose worker died, gets the error.
+    """
+    # Only import them when they are used.
+    import multiprocessing
+    from multiprocessing.queues import SimpleQueue
+
+    limits = limits or Limits()
+    profiles = [get_profile(file_path) for file_path in file_paths]
+    # Written to straight away, so it is there even if the worker dies
+    # right after.
+    started = SimpleQueue()
+    # The job number to its file and result, and to the pid of the process
+    # that runs it once it started.
+    pending = {}
+    running = {}
+    pools = []
+    try:
+        for lane, processes in zip(
+                schedule(profiles, big_cost),
+                (workers, big_workers)):
+            if not lane:
+                continue
+            pool = multiprocessing.Pool(
+                processes=processes,
+                initializer=_init_worker,
+                initargs=(started, limits.max_memory),
+            )
+            pools.append(pool)
+            for profile in lane:
+                index = len(pending)
+                pending[index] = (profile.file_path, pool.apply_async(
+                    _convert_job,
+                    (
+                        index,
+                        profile.file_path,
+                        limits,
+                        converter,
+                        fall_back,
+                        kwargs,
+                    ),
+                ))
+        # python 2 does not call back when a job fails to be sent and loses
+        # the job of a worker that died, look at every job instead.
+        while pending:
+            while not started.empty():
+                index, pid = started.get()
+                running[index] = pid
+            done = []
+            for index, (file_path, result) in sorted(pending.items()):
+                if not result.ready() and index in running:
+                    if not _is_alive(running[index]):
+                        # Give a result that was on its way the time to
+                        # arrive.
+                        result.wait(POLL_INTERVAL)
+                        if not result.ready():
+                            done.append(BatchResult(
+                                file_path,
+                                None,
+                                ConversionFailed(
+                                    'The worker converting the file died.',
+                                ),
+                            ))
+                            del pending[index]
+                    continue
+                if not result.ready():
+                    continue
+                del pending[index]
+                try:
+                    done.append(result.get())
+                except Exception as e:
+                    done.append(BatchResult(file_path, None, e))
+            for batch_result in done:
+                yield batch_result
+            if pending and not done:
+                # Wait for the first job that is left, or a while.
+                pending[min(pending)][1].wait(POLL_INTERVAL)
+    finally:
+        for pool in pools:
+            pool.terminate()
@@ -0,0 +1,60 @@
+"""
+A dict-like cache that only keeps the most recently used items.
+
+``convert`` uses one to keep the parsed styles and numbering between
+documents, it can also be passed as the ``image_cache`` or the
+``fragment_cache`` of ``convert`` to put a limit on how much they keep.
+"""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    Keeps at most ``maxsize`` items, the least recently used item is dropped
+    to make room for a new one. Safe to share between threads.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def __getitem__(self, key):
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                self.misses += 1
+                raise
+            self.hits += 1
+            self._items[key] = value
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = value
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,151 @@
+"""
+Compressed html output.
+
+``write_compressed`` converts a document straight into a gzip (or brotli)
+stream. The html is compressed a block at a time as ``iter_html`` renders it,
+so the whole html is never held uncompressed, and with ``etag=True`` the hash
+of the compressed bytes is taken on the way::
+
+    with open('path/to/cache.html.gz', 'wb') as f:
+        result = write_compressed('path/to/docx/file', f, etag=True)
+
+    # Serve the file with ``Content-Encoding: result.encoding`` and
+    # ``ETag: result.etag``.
+
+The gzip stream has no file name or timestamp in it, the same document gives
+the same bytes and the same ETag every time. The ``br`` encoding needs the
+``brotli`` module.
+"""
+import hashlib
+import zlib
+from collections import namedtuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from docx2html.core import iter_html
+
+GZIP = 'gzip'
+BROTLI = 'br'
+DEFAULT_LEVELS = {
+    GZIP: 6,
+    BROTLI: 11,
+}
+
+CompressedHtml = namedtuple(
+    'CompressedHtml',
+    ['encoding', 'html_bytes', 'compressed_bytes', 'etag'],
+)
+
+
+def get_encodings():
+    """
+    Return the encodings that can be written, in order of preference.
+    """
+    if brotli is None:
+        return [GZIP]
+    return [BROTLI, GZIP]
+
+
+class _GzipCompressor(object):
+    def __init__(self, level):
+        # 16 + MAX_WBITS writes a gzip header (with a zero mtime) and trailer
+        # around the deflate stream.
+        self._compressor = zlib.compressobj(
+            level,
+            zlib.DEFLATED,
+            16 + zlib.MAX_WBITS,
+        )
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliCompressor(object):
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class CompressedWriter(object):
+    """
+    Compresses everything that is written to it into the file object ``f``.
+    ``close`` finishes the stream, it does not close ``f``, and returns a
+    ``CompressedHtml``.
+    """
+    def __init__(self, f, encoding=GZIP, level=None, etag=False):
+        if encoding == GZIP:
+            compressor_class = _GzipCompressor
+        elif encoding == BROTLI:
+            if brotli is None:
+                raise ImportError('The br encoding needs brotli.')
+            compressor_class = _BrotliCompressor
+        else:
+            raise ValueError('Unsupported encoding: %r' % encoding)
+        if level is None:
+            level = DEFAULT_LEVELS[encoding]
+        self.encoding = encoding
+        self.html_bytes = 0
+        self.compressed_bytes = 0
+        self._f = f
+        self._compressor = compressor_class(level)
+        self._hash = hashlib.sha1() if etag else None
+
+    def _output(self, data):
+        if not data:
+            return
+        self.compressed_bytes += len(data)
+        if self._hash is not None:
+            self._hash.update(data)
+        self._f.write(data)
+
+    def write(self, html):
+        if not isinstance(html, bytes):
+            html = html.encode('utf-8')
+        self.html_bytes += len(html)
+        self._output(self._compressor.compress(html))
+
+    def close(self):
+        self._output(self._compressor.finish())
+        etag = None
+        if self._hash is not None:
+            etag = '"%s"' % self._hash.hexdigest()
+        return CompressedHtml(
+            encoding=self.encoding,
+            html_bytes=self.html_bytes,
+            compressed_bytes=self.compressed_bytes,
+            etag=etag,
+        )
+
+
+def write_compressed(
+        file_path,
+        f,
+        encoding=GZIP,
+        level=None,
+        etag=False,
+        **kwargs):
+    """
+    ``file_path`` is the document to convert, the other keyword arguments
+        are passed on to ``iter_html`` (the same as for ``convert``).
+    ``f`` is the file object the compressed html is written to.
+    ``encoding`` is ``gzip`` or ``br``, the value for ``Content-Encoding``.
+    ``level`` is the compression level, ``DEFAULT_LEVELS`` if it is None.
+    ``etag`` is whether to compute an ETag from the compressed bytes.
+
+    Returns a ``CompressedHtml``
+    """
+    writer = CompressedWriter(f, encoding=encoding, level=level, etag=etag)
+    for html in iter_html(file_path, **kwargs):
+        writer.write(html)
+    return writer.close()
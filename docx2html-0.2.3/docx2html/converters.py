@@ -1,4 +1,40 @@
+"""
+Converters from other formats to docx, to pass as the ``converter`` of
+``convert``.
+
+``convert_with_abiword`` starts ``abiword`` for every file and waits for it.
+``ConverterPool`` runs the converter on a bounded number of workers instead,
+kills a converter that takes longer than ``timeout`` seconds for a file (the
+worker starts a new one for its next job), and converts queued files in one
+invocation when the backend can::
+
+    with ConverterPool(AbiwordBackend(), workers=2, timeout=60) as pool:
+        html = convert('path/to/file.doc', converter=pool.convert)
+        converted = pool.convert_many([
+            (docx_path, file_path) for ...
+        ])
+
+``StubBackend`` stands in for a real converter in tests.
+"""
+import os
+import signal
 import subprocess
+import sys
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from docx2html.core import replace_ext
+
+DEFAULT_WORKERS = 2
+# Seconds a converter may take per file.
+DEFAULT_TIMEOUT = 60
+# Seconds between checks on a running converter.
+POLL_INTERVAL = 0.05
 
 
 def convert_with_abiword(docx_path, file_path):
@@ -15,3 +51,312 @@ def convert_with_abiword(docx_path, file_path):
             file_path,
         ],
     )
+
+
+class Backend(object):
+    """
+    How to run a converter. ``get_command`` returns the command that
+    converts the ``jobs`` (with a ``docx_path`` and a ``file_path`` each), at
+    most ``batch_size`` of them, and only jobs that ``can_batch`` are put in
+    a command with others.
+    """
+    batch_size = 1
+
+    def get_command(self, jobs):
+        raise NotImplementedError()
+
+    def can_batch(self, job):
+        return True
+
+
+class AbiwordBackend(Backend):
+    """
+    Runs ``abiword``. It converts several files at once when the docx goes
+    next to the file, with the same name.
+    """
+    batch_size = 10
+
+    def get_command(self, jobs):
+        if len(jobs) == 1:
+            return [
+                'abiword',
+                '--to=docx',
+                '--to-name',
+                jobs[0].docx_path,
+                jobs[0].file_path,
+            ]
+        return ['abiword', '--to=docx'] + [job.file_path for job in jobs]
+
+    def can_batch(self, job):
+        return job.docx_path == replace_ext(job.file_path, '.docx')
+
+
+_STUB_SCRIPT = '''
+import shutil, sys, time
+args = sys.argv[1:]
+for file_path, docx_path in zip(args[::2], args[1::2]):
+    with open(file_path, 'rb') as f:
+        start = f.read(4)
+    if start == b'hang':
+        time.sleep(3600)
+    if start == b'fail':
+        sys.exit(1)
+    if start == b'part':
+        with open(docx_path, 'wb') as f:
+            f.write(b'PK')
+        time.sleep(3600)
+    if start == b'slow':
+        time.sleep(float(open(file_path, 'rb').read()[4:]))
+    shutil.copyfile(file_path, docx_path)
+'''
+
+
+class StubBackend(Backend):
+    """
+    A converter for tests that does not need anything installed. It
+    "converts" a file by copying it, so the files to convert are docx files
+    with another extension. A file that starts with ``hang`` makes it hang,
+    one that starts with ``part`` makes it hang after writing the start of
+    the docx, one that starts with ``slow`` and a number of seconds makes it
+    take that long, and one that starts with ``fail`` makes it stop without
+    converting it or the files after it.
+    """
+    batch_size = 10
+
+    def get_command(self, jobs):
+        command = [sys.executable, '-c', _STUB_SCRIPT]
+        for job in jobs:
+            command.extend([job.file_path, job.docx_path])
+        return command
+
+
+class _Job(object):
+    def __init__(self, docx_path, file_path):
+        self.docx_path = docx_path
+        self.file_path = file_path
+        self.done = threading.Event()
+        # What the backend raised for this job, if anything.
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return os.path.isfile(self.docx_path)
+
+
+def _kill(process):
+    # The converter runs in its own process group, kill everything it
+    # started as well.
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+class ConverterPool(object):
+    """
+    ``backend`` is the ``Backend`` to run, ``AbiwordBackend`` by default.
+    ``workers`` is how many converters run at a time.
+    ``timeout`` is how many seconds a converter may take for a file before
+        it is killed, counted from when the docx of the file before it
+        appeared. The docx it was writing is removed.
+    ``batch_size`` is the most files per converter, the backend's
+        ``batch_size`` if it is None.
+
+    ``convert`` takes the same arguments as ``convert_with_abiword``. Call
+    ``close`` (or use the pool as a context manager) to stop the workers. An
+    exception from the backend fails the files it was raised for (``convert``
+    raises it) and the worker goes on with the next files.
+    """
+    def __init__(
+            self,
+            backend=None,
+            workers=DEFAULT_WORKERS,
+            timeout=DEFAULT_TIMEOUT,
+            batch_size=None):
+        if backend is None:
+            backend = AbiwordBackend()
+        if workers < 1:
+            raise ValueError('workers must be at least 1.')
+        self.backend = backend
+        self.workers = workers
+        self.timeout = timeout
+        self.batch_size = batch_size or backend.batch_size
+        # How many converters were started and how many were killed.
+        self.commands = 0
+        self.timeouts = 0
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _start(self):
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work)
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def _can_batch(self, job):
+        try:
+            return self.backend.can_batch(job)
+        except Exception:
+            # Converted on its own, where the error is reported.
+            return False
+
+    def _get_batch(self, job):
+        batch = [job]
+        rest = []
+        if self.batch_size < 2 or not self._can_batch(job):
+            return batch, rest
+        # Take a fair share of what is queued, leave the rest to the other
+        # workers.
+        share = -(-(self._queue.qsize() + 1) // self.workers)
+        while len(batch) + len(rest) < min(share, self.batch_size):
+            try:
+                next_job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if next_job is None:
+                # Leave the stop for later.
+                self._queue.put(None)
+                break
+            if self._can_batch(next_job):
+                batch.append(next_job)
+            else:
+                rest.append(next_job)
+        return batch, rest
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch, rest = self._get_batch(job)
+            for jobs in [batch] + [[other] for other in rest]:
+                try:
+                    self._run_safely(jobs)
+                finally:
+                    for done_job in jobs:
+                        done_job.done.set()
+
+    def _call(self, command, jobs):
+        """
+        Run ``command`` for ``jobs``, return False if it was killed.
+        """
+        with self._lock:
+            self.commands += 1
+        with open(os.devnull, 'wb') as devnull:
+            process = subprocess.Popen(
+                command,
+                stdout=devnull,
+                stderr=devnull,
+                preexec_fn=os.setsid,
+            )
+        # Every file gets its own timeout, from when the one before it is
+        # there.
+        converted = 0
+        deadline = time.time() + self.timeout
+        while process.poll() is None:
+            count = sum(1 for job in jobs if os.path.isfile(job.docx_path))
+            if count > converted:
+                converted = count
+                deadline = time.time() + self.timeout
+            elif time.time() > deadline:
+                _kill(process)
+                process.wait()
+                with self._lock:
+                    self.timeouts += 1
+                return False
+            time.sleep(POLL_INTERVAL)
+        return True
+
+    def _run(self, jobs):
+        try:
+            finished = self._call(self.backend.get_command(jobs), jobs)
+        except OSError:
+            # The converter is not installed.
+            return
+        if not finished:
+            # The docx it was writing when it was killed can be cut short.
+            # The files are converted in order, the ones before are done.
+            written = [job for job in jobs if os.path.isfile(job.docx_path)]
+            if written:
+                try:
+                    os.remove(written[-1].docx_path)
+                except OSError:
+                    pass
+        if len(jobs) == 1:
+            return
+        # Give the files a batch did not convert a converter of their own,
+        # so that one bad file does not fail the others.
+        for job in jobs:
+            if not os.path.isfile(job.docx_path):
+                self._run_safely([job])
+
+    def _run_safely(self, jobs):
+        # An error of the backend fails the jobs, not the worker.
+        try:
+            self._run(jobs)
+        except Exception as e:
+            if len(jobs) == 1:
+                jobs[0].error = e
+                return
+            # Find out which of the files it was.
+            for job in jobs:
+                if not os.path.isfile(job.docx_path):
+                    self._run_safely([job])
+
+    def submit(self, docx_path, file_path):
+        """
+        Queue ``file_path`` to be converted to ``docx_path``. Returns the
+        job, its ``wait`` method returns whether the docx is there.
+        """
+        job = _Job(docx_path, file_path)
+        self._queue.put(job)
+        self._start()
+        return job
+
+    def convert(self, docx_path, file_path):
+        """
+        Convert ``file_path`` to docx at ``docx_path`` and wait for it.
+        """
+        return self.submit(docx_path, file_path).wait()
+
+    def convert_many(self, paths):
+        """
+        Convert every ``(docx_path, file_path)`` in ``paths`` and wait for
+        all of them. Returns whether each docx is there, in order, a file the
+        backend raised an exception for is not there.
+        """
+        jobs = [_Job(docx_path, file_path) for docx_path, file_path in paths]
+        # Queue them all before a worker starts so they can be batched.
+        for job in jobs:
+            self._queue.put(job)
+        self._start()
+        converted = []
+        for job in jobs:
+            try:
+                converted.append(job.wait())
+            except Exception:
+                converted.append(False)
+        return converted
+
+    def close(self):
+        """
+        Stop the workers once the queued files are converted.
+        """
+        with self._lock:
+            threads = list(self._threads)
+            self._threads = []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
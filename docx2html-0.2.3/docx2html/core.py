@@ -1,15 +1,25 @@
+import atexit
+import binascii
 import cgi
+import functools
+import hashlib
+import json
 import logging
 import os
 import os.path
 import re
-from PIL import Image
+import sys
+import threading
+from copy import deepcopy
 from lxml import etree
 from lxml.etree import XMLSyntaxError
 
 from collections import namedtuple, defaultdict
+from itertools import chain
+from xml.sax.saxutils import unescape
 from zipfile import ZipFile, BadZipfile
 
+from docx2html.cache import LRUCache
 from docx2html.exceptions import (
     ConversionFailed,
     FileNotDocx,
@@ -17,15 +27,46 @@ from docx2html.exceptions import (
     UnintendedTag,
     SyntaxNotSupported,
 )
+from docx2html.profiling import CallProfiler
 
 DETECT_FONT_SIZE = False
 EMUS_PER_PIXEL = 9525
 NSMAP = {}
 IMAGE_EXTENSIONS_TO_SKIP = ['emf', 'wmf', 'svg']
 DEFAULT_LIST_NUMBERING_STYLE = 'decimal'
+# The parsed styles and numbering of recently converted documents, keyed on
+# the crc and size of the part in the zip directory. Most documents made from
+# the same template share them. Set to None to always parse them.
+PARTS_CACHE = LRUCache(32)
+# The xml parts of a docx are read and parsed on this many threads, set to 0
+# to read them one after another.
+PARSE_THREADS = 4
+# Part of the key of every fragment in a ``fragment_cache``, bump this when
+# the html generated for a block changes.
+FRAGMENT_CACHE_VERSION = 1
+# The img tag of an image in a fragment, with the other attributes. Only
+# matched as an img tag, text of the document that looks like one is escaped
+# (``&lt;``).
+FRAGMENT_IMAGE_REGEX = re.compile(
+    r'<img src="docx2html-fragment-image-([0-9a-f]+)"([^>]*?) />',
+)
+# A closing tag directly followed by the same opening tag.
+ADJACENT_RUNS_REGEX = re.compile(r'</(strong|em)><\1>')
 
 logger = logging.getLogger(__name__)
 
+_thread_pool = None
+_thread_pool_pid = None
+_thread_pool_lock = threading.Lock()
+
+# When set to a ``CallProfiler`` every function wrapped with ``ensure_tag``
+# records its calls there. Use ``docx2html.profiling.profile`` to set it for a
+# block of code, or set DOCX2HTML_PROFILE to profile the whole process.
+PROFILER = None
+if os.environ.get('DOCX2HTML_PROFILE'):
+    PROFILER = CallProfiler()
+    atexit.register(PROFILER.write_report, sys.stderr)
+
 ###
 # Help functions
 ###
@@ -51,7 +92,15 @@ def ensure_tag(tags):
     # the right kind.
 
     def wrapped(f):
+        @functools.wraps(f)
         def wrap(*args, **kwargs):
+            if PROFILER is not None:
+                return PROFILER.record(
+                    f,
+                    _has_valid_tag(args[0], tags),
+                    args,
+                    kwargs,
+                )
             passed_in_tag = args[0]
             if passed_in_tag is None:
                 return None
@@ -66,6 +115,13 @@ def ensure_tag(tags):
     return wrapped
 
 
+def _has_valid_tag(el, tags):
+    if el is None:
+        return False
+    w_namespace = get_namespace(el, 'w')
+    return el.tag in ['%s%s' % (w_namespace, t) for t in tags]
+
+
 def get_namespace(el, namespace):
     if namespace not in NSMAP:
         NSMAP[namespace] = '{%s}' % el.nsmap[namespace]
@@ -73,6 +129,8 @@ def get_namespace(el, namespace):
 
 
 def convert_image(target, image_size):
+    # PIL is only needed for documents with images, do not import it up front.
+    from PIL import Image
     _, extension = os.path.splitext(os.path.basename(target))
     # If the image size has a zero in it early return
     if image_size and not all(image_size):
@@ -232,7 +290,7 @@ def _is_top_level_upper_roman(el, meta_data):
     if ilvl != 0:
         return False
     numId = get_numId(el, w_namespace)
-    list_type = meta_data.numbering_dict[numId].get(ilvl, False)
+    list_type = meta_data.numbering_dict.get(numId, {}).get(ilvl, False)
     return list_type == 'upperRoman'
 
 
@@ -622,8 +680,15 @@ MetaData = namedtuple(
         'font_sizes_dict',
         'image_handler',
         'image_sizes',
+        # The ``p`` and ``tbl`` elements of the document in order, from
+        # ``scan_document``. If it is None ``create_html`` scans the document.
+        'elements',
     ],
 )
+MetaData.__new__.__defaults__ = (None,)
+
+# What a ``bulk_image_handler`` gets for every image in the document.
+ImageInfo = namedtuple('ImageInfo', ['image_id', 'path', 'size'])
 
 
 ###
@@ -641,34 +706,50 @@ def get_numbering_info(tree):
     if tree is None:
         return {}
     w_namespace = get_namespace(tree, 'w')
+    return _get_numbering_dict(chain(
+        tree.findall('%snum' % w_namespace),
+        tree.findall('%sabstractNum' % w_namespace),
+    ))
+
+
+def _get_numbering_dict(elements):
+    """
+    ``get_numbering_info`` from the ``num`` and ``abstractNum`` elements of
+    numbering.xml, in any order.
+    """
     num_ids = {}
-    result = defaultdict(dict)
-    # First find all the list types
-    for list_type in tree.findall('%snum' % w_namespace):
-        list_id = list_type.get('%snumId' % w_namespace)
-
-        # Each list type is assigned an abstractNumber that defines how lists
-        # should look.
-        abstract_number = list_type.find('%sabstractNumId' % w_namespace)
-        num_ids[abstract_number.get('%sval' % w_namespace)] = list_id
-
-    # Loop through all the abstractNumbers
-    for abstract_number in tree.findall('%sabstractNum' % w_namespace):
-        abstract_num_id = abstract_number.get('%sabstractNumId' % w_namespace)
-        # If we find an abstractNumber that is not being used in the document
-        # then ignore it.
-        if abstract_num_id not in num_ids:
+    abstract_levels = []
+    for el in elements:
+        w_namespace = get_namespace(el, 'w')
+        if el.tag == '%snum' % w_namespace:
+            # Find all the list types
+            list_id = el.get('%snumId' % w_namespace)
+
+            # Each list type is assigned an abstractNumber that defines how
+            # lists should look.
+            abstract_number = el.find('%sabstractNumId' % w_namespace)
+            num_ids[abstract_number.get('%sval' % w_namespace)] = list_id
             continue
 
-        # Get the level of the abstract number.
-        for lvl in abstract_number.findall('%slvl' % w_namespace):
+        # Get the levels of the abstract number.
+        abstract_num_id = el.get('%sabstractNumId' % w_namespace)
+        for lvl in el.findall('%slvl' % w_namespace):
             ilvl = int(lvl.get('%silvl' % w_namespace))
             lvl_format = lvl.find('%snumFmt' % w_namespace)
             list_style = lvl_format.get('%sval' % w_namespace)
-            # Based on the list type and the ilvl (indentation level) store the
-            # needed style.
-            result[num_ids[abstract_num_id]][ilvl] = list_style
-    return result
+            abstract_levels.append((abstract_num_id, ilvl, list_style))
+
+    result = defaultdict(dict)
+    for abstract_num_id, ilvl, list_style in abstract_levels:
+        # If we find an abstractNumber that is not being used in the document
+        # then ignore it.
+        if abstract_num_id not in num_ids:
+            continue
+        # Based on the list type and the ilvl (indentation level) store the
+        # needed style.
+        result[num_ids[abstract_num_id]][ilvl] = list_style
+    # A plain dict, looking up a list that is not there must not add it.
+    return dict(result)
 
 
 def get_style_dict(tree):
@@ -676,6 +757,15 @@ def get_style_dict(tree):
     Some things that are considered lists are actually supposed to be H tags
     (h1, h2, etc.) These can be denoted by their styleId
     """
+    if tree is None:
+        return {}
+    return _get_style_dict(tree)
+
+
+def _get_style_dict(elements):
+    """
+    ``get_style_dict`` from the ``style`` elements of styles.xml.
+    """
     # This is a partial document and actual h1 is the document title, which
     # will be displayed elsewhere.
     headers = {
@@ -690,11 +780,9 @@ def get_style_dict(tree):
         'heading 9': 'h6',
         'heading 10': 'h6',
     }
-    if tree is None:
-        return {}
-    w_namespace = get_namespace(tree, 'w')
     result = {}
-    for el in tree:
+    for el in elements:
+        w_namespace = get_namespace(el, 'w')
         style_id = el.get('%sstyleId' % w_namespace)
         el_result = {
             'header': False,
@@ -729,26 +817,58 @@ def get_style_dict(tree):
     return result
 
 
+def _get_drawing_size(drawing, result):
+    for el in drawing.iter():
+        if 'a' not in el.nsmap:
+            continue
+        a_namespace = get_namespace(el, 'a')
+        if el.tag == '%sxfrm' % a_namespace:
+            ext = el.find('%sext' % a_namespace)
+            cx = int(ext.get('cx')) / EMUS_PER_PIXEL
+            cy = int(ext.get('cy')) / EMUS_PER_PIXEL
+            result[get_image_id(drawing)] = (cx, cy)
+
+
 def get_image_sizes(tree):
-    drawings = []
     result = {}
     w_namespace = get_namespace(tree, 'w')
     for el in tree.iter():
         if el.tag == '%sdrawing' % w_namespace:
-            drawings.append(el)
-    for d in drawings:
-        for el in d.iter():
-            if 'a' not in el.nsmap:
-                continue
-            a_namespace = get_namespace(el, 'a')
-            if el.tag == '%sxfrm' % a_namespace:
-                ext = el.find('%sext' % a_namespace)
-                cx = int(ext.get('cx')) / EMUS_PER_PIXEL
-                cy = int(ext.get('cy')) / EMUS_PER_PIXEL
-                result[get_image_id(d)] = (cx, cy)
+            _get_drawing_size(el, result)
     return result
 
 
+def scan_document(tree):
+    """
+    Walk ``tree`` once for everything that is needed from it before the html
+    is built. The ``sectPr`` tags are removed, and the sizes of the images and
+    the ``p`` and ``tbl`` elements, in document order, are returned.
+    """
+    w_namespace = get_namespace(tree, 'w')
+    p_tag = '%sp' % w_namespace
+    tbl_tag = '%stbl' % w_namespace
+    drawing_tag = '%sdrawing' % w_namespace
+    sect_pr_tag = '%ssectPr' % w_namespace
+    image_sizes = {}
+    elements = []
+    sect_prs = []
+    for el in tree.iter():
+        if el.tag == p_tag or el.tag == tbl_tag:
+            elements.append(el)
+        elif el.tag == drawing_tag:
+            _get_drawing_size(el, image_sizes)
+        elif el.tag == sect_pr_tag:
+            sect_prs.append(el)
+    # Removing them during the walk would end it early.
+    removed = set()
+    for sect_pr in sect_prs:
+        removed.update(sect_pr.iter())
+        sect_pr.getparent().remove(sect_pr)
+    if removed:
+        elements = [el for el in elements if el not in removed]
+    return image_sizes, elements
+
+
 def get_relationship_info(tree, media, image_sizes):
     """
     There is a separate file holds the targets to links as well as the targets
@@ -757,31 +877,154 @@ def get_relationship_info(tree, media, image_sizes):
     """
     if tree is None:
         return {}
+    return _get_relationship_dict(
+        [(el.get('Id'), el.get('Target')) for el in tree.iter()],
+        media,
+        image_sizes,
+    )
+
+
+def _get_relationship_dict(relationships, media, image_sizes):
+    """
+    ``get_relationship_info`` from a list of the ``Id`` and ``Target`` of
+    every relationship.
+    """
     result = {}
+    # Images that are shown several times at the same size are only
+    # converted once.
+    converted_images = {}
     # Loop through each relationship.
-    for el in tree.iter():
-        el_id = el.get('Id')
+    for el_id, target in relationships:
         if el_id is None:
             continue
         # Store the target in the result dict.
-        target = el.get('Target')
         if any(
                 target.lower().endswith(ext) for
                 ext in IMAGE_EXTENSIONS_TO_SKIP):
             continue
         if target in media:
             image_size = image_sizes.get(el_id)
-            target = convert_image(media[target], image_size)
+            key = (media[target], image_size)
+            if key not in converted_images:
+                converted_images[key] = convert_image(
+                    media[target],
+                    image_size,
+                )
+            target = converted_images[key]
         # cgi will replace things like & < > with &amp; &lt; &gt;
         result[el_id] = cgi.escape(target)
 
     return result
 
 
-def get_font_sizes_dict(tree, styles_dict):
+def get_referenced_images(tree, relationship_dict, image_sizes):
+    """
+    Return an ``ImageInfo`` for every image the document shows, in document
+    order. An image that is shown several times, or that shares its file
+    with another image, is only returned once.
+    """
+    w_namespace = get_namespace(tree, 'w')
+    image_tags = (
+        '%sdrawing' % w_namespace,
+        '%spict' % w_namespace,
+    )
+    result = []
+    seen_paths = set()
+    for el in tree.iter():
+        if el.tag not in image_tags:
+            continue
+        image_id = get_image_id(el)
+        if image_id not in relationship_dict:
+            continue
+        # The relationship dict has the targets escaped for html.
+        path = unescape(relationship_dict[image_id])
+        if path in seen_paths:
+            continue
+        seen_paths.add(path)
+        result.append(ImageInfo(
+            image_id=image_id,
+            path=path,
+            size=image_sizes.get(image_id),
+        ))
+    return result
+
+
+def _get_bulk_image_handler(images, srcs, image_handler):
+    # Images that share a file share the src. Images that the bulk image
+    # handler did not return a src for fall back to the regular image
+    # handler.
+    srcs_by_path = dict(
+        (image.path, srcs[image.image_id])
+        for image in images
+        if image.image_id in srcs
+    )
+
+    def bulk_image_handler(image_id, relationship_dict):
+        path = unescape(relationship_dict[image_id])
+        if path in srcs_by_path:
+            return srcs_by_path[path]
+        return image_handler(image_id, relationship_dict)
+    return bulk_image_handler
+
+
+def _get_image_hash(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except (IOError, OSError):
+        return None
+
+
+def _get_deduplicated_image_handler(image_handler, image_cache=None):
+    """
+    Call ``image_handler`` once per image file. With an ``image_cache`` (a
+    dict) images with the same content share the src across every document
+    converted with that cache.
+    """
+    srcs = {}
+
+    def deduplicated_image_handler(image_id, relationship_dict):
+        target = relationship_dict[image_id]
+        if target in srcs:
+            return srcs[target]
+        key = None
+        if image_cache is not None:
+            key = _get_image_hash(unescape(target))
+        if key is not None and key in image_cache:
+            src = image_cache[key]
+        else:
+            src = image_handler(image_id, relationship_dict)
+            if key is not None:
+                image_cache[key] = src
+        srcs[target] = src
+        return src
+    return deduplicated_image_handler
+
+
+def _extract_media(f, item, path, extracted):
+    """
+    Extract ``item`` from the zip file ``f`` to ``path`` unless a file with the
+    same content has already been extracted, return the extracted path.
+    ``extracted`` maps the crc and size of every extracted item to the item
+    and its path.
+    """
+    key = (item.CRC, item.file_size)
+    # The crc and size come from the zip directory, the content only needs
+    # to be read when they match.
+    for other_item, other_path in extracted.get(key, []):
+        if f.read(other_item.filename) == f.read(item.filename):
+            return other_path
+    target = f.extract(item.filename, path)
+    extracted.setdefault(key, []).append((item, target))
+    return target
+
+
+def get_font_sizes_dict(tree, styles_dict, paragraphs=None):
+    if paragraphs is None:
+        paragraphs = tree.xpath('//w:p', namespaces=tree.nsmap)
     font_sizes_dict = defaultdict(int)
     # Get all the fonts sizes and how often they are used in a dict.
-    for p in tree.xpath('//w:p', namespaces=tree.nsmap):
+    for p in paragraphs:
         # If this p tag is a natural header, skip it
         if is_natural_header(p, styles_dict):
             continue
@@ -813,7 +1056,165 @@ def get_font_sizes_dict(tree, styles_dict):
     return result
 
 
-def _get_document_data(f, image_handler=None):
+def _iter_part_elements(f, item, *tags):
+    """
+    Yield the elements of the part ``item`` of the zip file ``f`` that match
+    one of ``tags`` while the part is parsed. Each element is cleared once
+    the next one is asked for and everything before it is thrown away, so a
+    large part is never in memory as a whole.
+    """
+    source = f.open(item.filename)
+    try:
+        for _, el in etree.iterparse(source, tag=tags):
+            yield el
+            el.clear()
+            while el.getprevious() is not None:
+                del el.getparent()[0]
+    finally:
+        source.close()
+
+
+def _get_part_dict(f, item, get_dict):
+    """
+    Return ``get_dict(f, item)`` for the part ``item`` of the zip file ``f``,
+    from ``PARTS_CACHE`` if a part with the same crc and size has been seen.
+    """
+    key = (item.filename, item.CRC, item.file_size)
+    if PARTS_CACHE is not None:
+        try:
+            return _copy_part_dict(PARTS_CACHE[key])
+        except KeyError:
+            pass
+    result = get_dict(f, item)
+    if PARTS_CACHE is not None:
+        PARTS_CACHE[key] = result
+        return _copy_part_dict(result)
+    return result
+
+
+def _copy_part_dict(part_dict):
+    # The cached dicts are shared by every conversion (on any thread), each
+    # conversion gets its own copy of both levels.
+    return dict((key, dict(value)) for key, value in part_dict.items())
+
+
+def _get_thread_pool():
+    global _thread_pool, _thread_pool_pid
+    with _thread_pool_lock:
+        # A pool inherited from the parent of a forked process has no
+        # threads, start a new one.
+        if _thread_pool is None or _thread_pool_pid != os.getpid():
+            # Only import it when it is used.
+            from multiprocessing.pool import ThreadPool
+            _thread_pool = ThreadPool(PARSE_THREADS)
+            _thread_pool_pid = os.getpid()
+        return _thread_pool
+
+
+def _get_parser():
+    # lxml parsers can not be shared between threads.
+    return etree.XMLParser(strip_cdata=False)
+
+
+def _read_document_part(f, item):
+    document_xml = etree.fromstring(f.read(item.filename), _get_parser())
+    image_sizes, elements = scan_document(document_xml)
+    return document_xml, image_sizes, elements
+
+
+# styles.xml, numbering.xml and the relationships are streamed, only the
+# elements that are read are kept around (styles.xml mostly holds latent
+# styles that are never looked at).
+def _get_numbering_part_dict(f, item):
+    return _get_numbering_dict(
+        _iter_part_elements(f, item, '{*}abstractNum', '{*}num'),
+    )
+
+
+def _get_styles_part_dict(f, item):
+    return _get_style_dict(_iter_part_elements(f, item, '{*}style'))
+
+
+def _read_numbering_part(f, item):
+    return _get_part_dict(f, item, _get_numbering_part_dict)
+
+
+def _read_styles_part(f, item):
+    return _get_part_dict(f, item, _get_styles_part_dict)
+
+
+def _read_relationships_part(f, item):
+    try:
+        return [
+            (el.get('Id'), el.get('Target'))
+            for el in _iter_part_elements(f, item, '{*}Relationship')
+        ]
+    except XMLSyntaxError:
+        return []
+
+
+# The parts of the docx that are needed and what to do with them. Each
+# function is called with the ``ZipFile`` and the ``ZipInfo`` of the part.
+PART_READERS = {
+    # This file holds all the content of the document.
+    'word/document.xml': _read_document_part,
+    # This file tells document.xml how lists should look.
+    'word/numbering.xml': _read_numbering_part,
+    'word/styles.xml': _read_styles_part,
+    # This file holds the targets for hyperlinks and images.
+    'word/_rels/document.xml.rels': _read_relationships_part,
+}
+
+
+class _Result(object):
+    # The same interface as the results of ``ThreadPool.apply_async``.
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def _read_part_from_path(reader, file_path, item):
+    zf = ZipFile(file_path)
+    try:
+        return reader(zf, item)
+    finally:
+        zf.close()
+
+
+def _read_parts(f):
+    """
+    Start reading the parts in ``PART_READERS`` from the zip file ``f``,
+    return a dict of part names to results with a ``get`` method.
+    """
+    # A zip file can only read one part at a time, the threads open the file
+    # again from its path. Without a path the parts are read one at a time.
+    concurrent = (
+        PARSE_THREADS and
+        isinstance(f.filename, basestring) and
+        os.path.isfile(f.filename)
+    )
+    results = {}
+    for item in f.infolist():
+        if item.filename not in PART_READERS:
+            continue
+        reader = PART_READERS[item.filename]
+        if concurrent:
+            results[item.filename] = _get_thread_pool().apply_async(
+                _read_part_from_path,
+                (reader, f.filename, item),
+            )
+        else:
+            results[item.filename] = _Result(reader(f, item))
+    return results
+
+
+def _get_document_data(
+        f,
+        image_handler=None,
+        bulk_image_handler=None,
+        image_cache=None):
     '''
     ``f`` is a ``ZipFile`` that is open
     Extract out the document data, numbering data and the relationship data.
@@ -822,55 +1223,72 @@ def _get_document_data(f, image_handler=None):
         def image_handler(image_id, relationship_dict):
             return relationship_dict.get(image_id)
 
-    document_xml = None
-    numbering_xml = None
-    relationship_xml = None
-    styles_xml = None
-    parser = etree.XMLParser(strip_cdata=False)
     path, _ = os.path.split(f.filename)
+    # The parts are parsed on other threads while the media is extracted.
+    parts = _read_parts(f)
     media = {}
-    image_sizes = {}
+    extracted_media = {}
     # Loop through the files in the zip file.
     for item in f.infolist():
-        # This file holds all the content of the document.
-        if item.filename == 'word/document.xml':
-            xml = f.read(item.filename)
-            document_xml = etree.fromstring(xml, parser)
-        # This file tells document.xml how lists should look.
-        elif item.filename == 'word/numbering.xml':
-            xml = f.read(item.filename)
-            numbering_xml = etree.fromstring(xml, parser)
-        elif item.filename == 'word/styles.xml':
-            xml = f.read(item.filename)
-            styles_xml = etree.fromstring(xml, parser)
-        # This file holds the targets for hyperlinks and images.
-        elif item.filename == 'word/_rels/document.xml.rels':
-            xml = f.read(item.filename)
-            try:
-                relationship_xml = etree.fromstring(xml, parser)
-            except XMLSyntaxError:
-                relationship_xml = etree.fromstring('<xml></xml>', parser)
         if item.filename.startswith('word/media/'):
             # Strip off the leading word/
-            media[item.filename[len('word/'):]] = f.extract(
-                item.filename,
+            media[item.filename[len('word/'):]] = _extract_media(
+                f,
+                item,
                 path,
+                extracted_media,
             )
+    document_xml = None
+    image_sizes = {}
+    elements = None
+    relationships = []
+    if 'word/document.xml' in parts:
+        document_xml, image_sizes, elements = parts['word/document.xml'].get()
+    if 'word/numbering.xml' in parts:
+        numbering_dict = parts['word/numbering.xml'].get()
+    else:
+        numbering_dict = get_numbering_info(None)
+    if 'word/styles.xml' in parts:
+        styles_dict = parts['word/styles.xml'].get()
+    else:
+        styles_dict = get_style_dict(None)
+    if 'word/_rels/document.xml.rels' in parts:
+        relationships = parts['word/_rels/document.xml.rels'].get()
     # Close the file pointer.
     f.close()
 
     # Get dictionaries for the numbering and the relationships.
-    numbering_dict = get_numbering_info(numbering_xml)
-    image_sizes = get_image_sizes(document_xml)
-    relationship_dict = get_relationship_info(
-        relationship_xml,
+    relationship_dict = _get_relationship_dict(
+        relationships,
         media,
         image_sizes
     )
-    styles_dict = get_style_dict(styles_xml)
+    if bulk_image_handler is not None:
+        images = get_referenced_images(
+            document_xml,
+            relationship_dict,
+            image_sizes,
+        )
+        if image_cache is not None:
+            images = [
+                image for image in images
+                if _get_image_hash(image.path) not in image_cache
+            ]
+        if images:
+            image_handler = _get_bulk_image_handler(
+                images,
+                bulk_image_handler(images),
+                image_handler,
+            )
+    image_handler = _get_deduplicated_image_handler(image_handler, image_cache)
     font_sizes_dict = defaultdict(int)
     if DETECT_FONT_SIZE:
-        font_sizes_dict = get_font_sizes_dict(document_xml, styles_dict)
+        w_namespace = get_namespace(document_xml, 'w')
+        font_sizes_dict = get_font_sizes_dict(
+            document_xml,
+            styles_dict,
+            [el for el in elements if el.tag == '%sp' % w_namespace],
+        )
     meta_data = MetaData(
         numbering_dict=numbering_dict,
         relationship_dict=relationship_dict,
@@ -878,6 +1296,7 @@ def _get_document_data(f, image_handler=None):
         font_sizes_dict=font_sizes_dict,
         image_handler=image_handler,
         image_sizes=image_sizes,
+        elements=elements,
     )
     return document_xml, meta_data
 
@@ -1189,6 +1608,7 @@ def get_t_tag_content(
 
 
 def _get_image_size_from_image(target):
+    from PIL import Image
     image = Image.open(target)
     return image.size
 
@@ -1338,16 +1758,22 @@ def get_element_content(
 
     # This function does not return a p tag since other tag types need this as
     # well (td, li).
-    return p_text
+    return merge_adjacent_runs(p_text)
 
 
-def _strip_tag(tree, tag):
+def merge_adjacent_runs(html):
     """
-    Remove all tags that have the tag name ``tag``
+    Word splits text into many runs (for spell checking, revisions...) and
+    each run is styled on its own. Join neighbouring runs with the same
+    styling, ``<strong>a</strong><strong>b</strong>`` becomes
+    ``<strong>ab</strong>``.
     """
-    for el in tree.iter():
-        if el.tag == tag:
-            el.getparent().remove(el)
+    # Joining the outer tags can make the inner tags neighbours, keep going
+    # until nothing changes.
+    count = 1
+    while count:
+        html, count = ADJACENT_RUNS_REGEX.subn('', html)
+    return html
 
 
 def get_zip_file_handler(file_path):
@@ -1360,7 +1786,14 @@ def read_html_file(file_path):
     return html
 
 
-def convert(file_path, image_handler=None, fall_back=None, converter=None):
+def convert(
+        file_path,
+        image_handler=None,
+        fall_back=None,
+        converter=None,
+        bulk_image_handler=None,
+        image_cache=None,
+        fragment_cache=None):
     """
     ``file_path`` is a path to the file on the file system that you want to be
         converted to html.
@@ -1371,13 +1804,73 @@ def convert(file_path, image_handler=None, fall_back=None, converter=None):
         only be called if for whatever reason the conversion fails.
     ``converter`` is a function to convert a document that is not docx to docx
         (examples in docx2html.converters)
+    ``bulk_image_handler`` is a function that takes a list of ``ImageInfo``,
+        one per image in the document, and returns a dict of image_id to the
+        src attribute. It is called once, images it has no src for are passed
+        to ``image_handler``.
+    ``image_cache`` is a dict that is shared between conversions to only
+        handle images with the same content once (see readme).
+    ``fragment_cache`` is a dict that is shared between conversions to only
+        render the blocks of the document that are not in an earlier
+        conversion (see readme).
 
     Returns html extracted from ``file_path``
     """
+    zf, html = _open_docx(file_path, fall_back, converter)
+    if zf is None:
+        return html
+
+    # Need to populate the xml based on word/document.xml
+    tree, meta_data = _get_document_data(
+        zf,
+        image_handler,
+        bulk_image_handler,
+        image_cache,
+    )
+    if fragment_cache is not None:
+        return create_html_incremental(tree, meta_data, fragment_cache)
+    return create_html(tree, meta_data)
+
+
+def iter_html(
+        file_path,
+        image_handler=None,
+        fall_back=None,
+        converter=None,
+        bulk_image_handler=None,
+        image_cache=None):
+    """
+    ``convert`` that yields the html in pieces, one per top level block, as
+    the blocks are rendered. The pieces joined together are the html that
+    ``convert`` returns. The arguments are the same as for ``convert``.
+    """
+    zf, html = _open_docx(file_path, fall_back, converter)
+    if zf is None:
+        yield html
+        return
+
+    tree, meta_data = _get_document_data(
+        zf,
+        image_handler,
+        bulk_image_handler,
+        image_cache,
+    )
+    yield '<html>'
+    for el in iter_html_elements(tree, meta_data):
+        yield html_element_to_string(el)
+    yield '</html>'
+
+
+def _open_docx(file_path, fall_back, converter):
+    """
+    Return the docx of ``file_path`` as an open ``ZipFile``, converting it
+    with ``converter`` if it is not a docx. If there is no docx to read
+    return None and the html to use instead.
+    """
     file_base, extension = os.path.splitext(os.path.basename(file_path))
 
     if extension == '.html' or extension == '.htm':
-        return read_html_file(file_path)
+        return None, read_html_file(file_path)
 
     # Create the converted file as a file in the same dir with the
     # same name only with a .docx extension
@@ -1393,29 +1886,46 @@ def convert(file_path, image_handler=None, fall_back=None, converter=None):
             if fall_back is None:
                 raise ConversionFailed('Conversion to docx failed.')
             else:
-                return fall_back(file_path)
+                return None, fall_back(file_path)
 
     try:
         # Docx files are actually just zip files.
-        zf = get_zip_file_handler(docx_path)
+        return get_zip_file_handler(docx_path), None
     except BadZipfile:
         raise MalformedDocx('This file is not a docx')
 
-    # Need to populate the xml based on word/document.xml
-    tree, meta_data = _get_document_data(zf, image_handler)
-    return create_html(tree, meta_data)
-
 
 def create_html(tree, meta_data):
+    return html_element_to_string(create_html_element(tree, meta_data))
+
 
+def create_html_element(tree, meta_data):
+    """
+    Return the ``html`` element for the document ``tree``, ``create_html``
+    without the serialization.
+    """
     # Start the return value
     new_html = etree.Element('html')
+    for el in iter_html_elements(tree, meta_data):
+        new_html.append(el)
+    return new_html
 
-    w_namespace = get_namespace(tree, 'w')
-    visited_nodes = []
 
-    _strip_tag(tree, '%ssectPr' % w_namespace)
-    for el in tree.iter():
+def iter_html_elements(tree, meta_data):
+    """
+    Yield the top level elements of the html for the document ``tree`` one
+    at a time, as they are built.
+    """
+    w_namespace = get_namespace(tree, 'w')
+    # A set, since every element in the document is checked against it.
+    visited_nodes = set()
+
+    elements = meta_data.elements
+    if elements is None:
+        _, elements = scan_document(tree)
+    # Only p and tbl elements make it into the html, everything else is
+    # handled from there.
+    for el in elements:
         # The way lists are handled could double visit certain elements; keep
         # track of which elements have been visited and skip any that have been
         # visited already.
@@ -1426,13 +1936,11 @@ def create_html(tree, meta_data):
             p_text = get_element_content(el, meta_data)
             if p_text == '':
                 continue
-            new_html.append(
-                etree.XML('<%s>%s</%s>' % (
-                    header_value,
-                    p_text,
-                    header_value,
-                ))
-            )
+            yield etree.XML('<%s>%s</%s>' % (
+                header_value,
+                p_text,
+                header_value,
+            ))
         elif el.tag == '%sp' % w_namespace:
             # Strip out titles.
             if is_title(el):
@@ -1444,7 +1952,7 @@ def create_html(tree, meta_data):
                     li_nodes,
                     meta_data,
                 )
-                visited_nodes.extend(list_visited_nodes)
+                visited_nodes.update(list_visited_nodes)
             # Handle generic p tag here.
             else:
                 p_text = get_element_content(el, meta_data)
@@ -1453,19 +1961,22 @@ def create_html(tree, meta_data):
                     continue
 
                 new_el = etree.XML('<p>%s</p>' % p_text)
-            new_html.append(new_el)
+            yield new_el
 
         elif el.tag == '%stbl' % w_namespace:
             table_el, table_visited_nodes = build_table(
                 el,
                 meta_data,
             )
-            visited_nodes.extend(table_visited_nodes)
-            new_html.append(table_el)
+            visited_nodes.update(table_visited_nodes)
+            yield table_el
             continue
 
         # Keep track of visited_nodes
-        visited_nodes.append(el)
+        visited_nodes.add(el)
+
+
+def html_element_to_string(new_html):
     result = etree.tostring(
         new_html,
         method='html',
@@ -1488,3 +1999,191 @@ def _make_void_elements_self_close(html):
             new_tag = '<%s />' % new_tag
             html = re.sub(match, new_tag, html)
     return html
+
+
+###
+# Incremental rendering
+###
+
+
+def _get_list_stop(li_nodes, meta_data):
+    """
+    Return the element after the list of ``li_nodes`` that
+    ``get_single_list_nodes_data`` looked at to find the end of the list, or
+    None if it did not look past the list.
+    """
+    last = li_nodes[-1]
+    w_namespace = get_namespace(last, 'w')
+    numId = get_numId(li_nodes[0], w_namespace)
+    # The list ended on its last item, whatever comes after.
+    if len(li_nodes) > 1 and is_last_li(last, meta_data, numId):
+        return None
+    el = last.getnext()
+    while el is not None and not has_text(el):
+        el = el.getnext()
+    return el
+
+
+def get_blocks(tree, meta_data):
+    """
+    Yield the top level elements of the document in blocks that can be
+    rendered on their own, with the serialized xml of each block. A list
+    (including anything nested in it) is one block, every other element is a
+    block by itself. Where a list ends depends on the element after it, so
+    that element (and the list it starts) is in the block of the list.
+    """
+    w_namespace = get_namespace(tree, 'w')
+    body = tree.find('%sbody' % w_namespace)
+    if body is None:
+        body = tree
+    children = [
+        el for el in body
+        if el.tag != '%ssectPr' % w_namespace
+    ]
+    xmls = [etree.tostring(el) for el in children]
+    positions = dict((el, i) for i, el in enumerate(children))
+    i = 0
+    while i < len(children):
+        end = i
+        # The elements of the lists in the block so far, the others start a
+        # list of their own.
+        list_nodes = set()
+        j = i
+        while j <= end:
+            el = children[j]
+            # Looking for numPr in the xml first is much faster than is_li.
+            if (
+                    el not in list_nodes and
+                    el.tag == '%sp' % w_namespace and
+                    'numPr' in xmls[j] and
+                    is_li(el, meta_data)):
+                li_nodes = list(get_single_list_nodes_data(el, meta_data))
+                list_nodes.update(li_nodes)
+                stop = _get_list_stop(li_nodes, meta_data)
+                for node in li_nodes + [stop]:
+                    end = max(end, positions.get(node, end))
+            j += 1
+        yield children[i:end + 1], ''.join(xmls[i:end + 1])
+        i = end + 1
+
+
+def _get_block_facts(block, meta_data, facts):
+    """
+    Yield everything outside of ``block`` that its html depends on: the
+    numbering, styles, relationships and image sizes it references.
+    ``facts`` keeps the serialized facts between blocks.
+    """
+    namespaces = {
+        'w': block[0].nsmap.get('w'),
+        'r': block[0].nsmap.get('r'),
+    }
+    references = [
+        ('numbering', './/w:numId/@w:val'),
+        ('styles', './/w:pStyle/@w:val | .//w:rStyle/@w:val'),
+    ]
+    if namespaces['r'] is not None:
+        references.append(('relationships', './/@r:*'))
+    for el in block:
+        for kind, xpath in references:
+            for value in el.xpath(xpath, namespaces=namespaces):
+                fact = (kind, str(value))
+                if fact not in facts:
+                    if kind == 'numbering':
+                        data = meta_data.numbering_dict.get(fact[1])
+                    elif kind == 'styles':
+                        data = meta_data.styles_dict.get(fact[1])
+                    else:
+                        data = [
+                            meta_data.relationship_dict.get(fact[1]),
+                            meta_data.image_sizes.get(fact[1]),
+                        ]
+                    facts[fact] = json.dumps([kind, fact[1], data])
+                yield facts[fact]
+
+
+def _get_document_key(meta_data):
+    # The facts that every block depends on.
+    key = hashlib.sha1(str(FRAGMENT_CACHE_VERSION))
+    key.update(json.dumps(sorted(meta_data.font_sizes_dict.items())))
+    return key
+
+
+def get_block_key(block, xml, meta_data, document_key=None, facts=None):
+    if document_key is None:
+        document_key = _get_document_key(meta_data)
+    if facts is None:
+        facts = {}
+    key = document_key.copy()
+    for fact in _get_block_facts(block, meta_data, facts):
+        key.update(fact)
+    key.update(xml)
+    return key.hexdigest()
+
+
+def _fragment_image_handler(image_id, relationship_dict):
+    # The real src is filled in once the fragments are put together.
+    return 'docx2html-fragment-image-%s' % binascii.hexlify(image_id)
+
+
+def _fill_img_tag(src, attributes=''):
+    """
+    Return the img tag ``convert`` writes for ``src`` followed by the
+    serialized ``attributes``: the src is parsed like the tag it is put in
+    and serialized as html, which escapes urls that are not ascii.
+    """
+    img = etree.tostring(
+        etree.XML('<img src="%s" />' % src),
+        method='html',
+    )
+    src = img[len('<img src="'):-len('">')]
+    return _make_void_elements_self_close(
+        '<img src="%s"%s>' % (src, attributes),
+    )
+
+
+def _render_block(tree, block, meta_data):
+    # Render a copy so that the document is left alone.
+    root = etree.Element(tree.tag, nsmap=tree.nsmap)
+    for el in block:
+        root.append(deepcopy(el))
+    html = create_html(root, meta_data)
+    return html[len('<html>'):-len('</html>')]
+
+
+def create_html_incremental(tree, meta_data, fragment_cache):
+    """
+    ``create_html`` that takes the html of every block that is in
+    ``fragment_cache`` from there, and only renders and adds the others.
+    """
+    # The blocks are rendered from copies, they have to be scanned again.
+    fragment_meta_data = meta_data._replace(
+        image_handler=_fragment_image_handler,
+        elements=None,
+    )
+    document_key = _get_document_key(meta_data)
+    facts = {}
+    fragments = []
+    for block, xml in get_blocks(tree, meta_data):
+        key = get_block_key(block, xml, meta_data, document_key, facts)
+        if key not in fragment_cache:
+            fragment_cache[key] = _render_block(
+                tree,
+                block,
+                fragment_meta_data,
+            )
+        fragments.append(fragment_cache[key])
+
+    srcs = {}
+
+    def fill_src(match):
+        image_id = binascii.unhexlify(match.group(1))
+        if image_id not in srcs:
+            srcs[image_id] = meta_data.image_handler(
+                image_id,
+                meta_data.relationship_dict,
+            )
+        return _fill_img_tag(srcs[image_id], match.group(2))
+    return FRAGMENT_IMAGE_REGEX.sub(
+        fill_src,
+        '<html>%s</html>' % ''.join(fragments),
+    )
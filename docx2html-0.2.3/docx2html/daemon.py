@@ -0,0 +1,293 @@
+"""
+A long running conversion worker.
+
+Starting a python process, importing lxml, PIL and docx2html often takes
+longer than converting a small document. The daemon pays for that once and
+then converts documents sent to it as JSON lines, either on stdin/stdout or
+on a Unix socket::
+
+    $ python -m docx2html.daemon
+    $ python -m docx2html.daemon --socket /tmp/docx2html.sock --workers 4
+
+Every request is a JSON object on a single line, with either the ``path`` of
+a file or the ``data`` of one (base64 encoded, ``filename`` is used for the
+extension)::
+
+    {"id": 1, "path": "/path/to/file.docx"}
+    {"id": 2, "data": "UEsDBBQABgAIAAAAIQ...", "filename": "file.docx"}
+
+And gets a single line back with the same ``id``::
+
+    {"id": 1, "html": "<html>...</html>", "media": [
+        {"image_id": "rId5", "path": "/path/to/word/media/image1.png"}]}
+    {"id": 2, "error": "MalformedDocx: This file is not a docx"}
+
+Images of documents sent as ``data`` are extracted to a temporary directory
+that is removed after the response, so their media always includes the image
+``data`` (base64 encoded). Pass ``"inline_media": true`` to get the data for
+documents sent as a ``path`` as well.
+
+With more than one worker the daemon forks after everything is imported, so
+the workers start warm.
+
+Documents from untrusted sources can be converted under limits (see
+``docx2html.limits``), a document that goes over one gets an error
+``LimitExceeded`` (or ``MemoryError``) and the worker goes on::
+
+    $ python -m docx2html.daemon --max-bytes 209715200 --timeout 60 \\
+        --max-memory 1073741824
+"""
+import base64
+import json
+import multiprocessing
+import os
+import os.path
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+from functools import partial
+from optparse import OptionParser
+from xml.sax.saxutils import unescape
+
+from docx2html.core import convert
+from docx2html.limits import Limits, convert_limited, set_memory_limit
+
+DEFAULT_FILENAME = 'document.docx'
+SOCKET_BACKLOG = 128
+
+
+def _warm_up():
+    # Load the PIL image plugins before forking, instead of once per worker
+    # on the first image.
+    from PIL import Image
+    Image.init()
+
+
+def _read_media(path):
+    try:
+        with open(path, 'rb') as f:
+            return base64.b64encode(f.read()).decode('ascii')
+    except (IOError, OSError):
+        return None
+
+
+def _convert(file_path, inline_media, limits=None):
+    media = {}
+
+    def image_handler(image_id, relationship_dict):
+        target = relationship_dict.get(image_id)
+        # The targets are escaped for the html, the media has the path.
+        media[image_id] = target if target is None else unescape(target)
+        return target
+
+    if limits is None:
+        html = convert(file_path, image_handler=image_handler)
+    else:
+        html = convert_limited(file_path, limits, image_handler=image_handler)
+    media_descriptors = []
+    for image_id, target in sorted(media.items()):
+        descriptor = {
+            'image_id': image_id,
+            'path': target,
+        }
+        if inline_media:
+            descriptor['data'] = _read_media(target)
+        media_descriptors.append(descriptor)
+    return html, media_descriptors
+
+
+def handle_request(request, limits=None):
+    """
+    Convert the document described by ``request`` (a dict) within
+    ``limits`` and return the response dict.
+    """
+    response = {'id': request.get('id')}
+    dp = None
+    try:
+        if 'data' in request:
+            dp = tempfile.mkdtemp()
+            filename = os.path.basename(
+                request.get('filename') or DEFAULT_FILENAME,
+            )
+            file_path = os.path.join(dp, filename)
+            with open(file_path, 'wb') as f:
+                f.write(base64.b64decode(request['data']))
+            inline_media = True
+        elif 'path' in request:
+            file_path = request['path']
+            inline_media = bool(request.get('inline_media'))
+        else:
+            raise ValueError('A request needs a "path" or "data".')
+        response['html'], response['media'] = _convert(
+            file_path,
+            inline_media,
+            limits,
+        )
+    except Exception as e:
+        response['error'] = '%s: %s' % (e.__class__.__name__, e)
+    finally:
+        if dp is not None:
+            shutil.rmtree(dp, ignore_errors=True)
+    return response
+
+
+def handle_line(line, limits=None):
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        return json.dumps({'id': None, 'error': 'ValueError: %s' % e})
+    return json.dumps(handle_request(request, limits))
+
+
+def _request_lines(f):
+    while True:
+        line = f.readline()
+        if not line:
+            break
+        if line.strip():
+            yield line
+
+
+def serve_stdio(stdin=None, stdout=None, workers=1, limits=None):
+    """
+    Answer the requests on ``stdin`` on ``stdout``. With more than one worker
+    the responses are written in the order they finish, use the ``id`` to
+    match them up.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    limits = limits or Limits()
+    handle = partial(handle_line, limits=limits)
+    if workers <= 1:
+        set_memory_limit(limits.max_memory)
+        responses = (handle(line) for line in _request_lines(stdin))
+        pool = None
+    else:
+        pool = multiprocessing.Pool(
+            processes=workers,
+            initializer=set_memory_limit,
+            initargs=(limits.max_memory,),
+        )
+        responses = pool.imap_unordered(handle, _request_lines(stdin))
+    try:
+        for response in responses:
+            stdout.write(response + '\n')
+            stdout.flush()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+def _serve_connection(connection, limits):
+    rfile = connection.makefile('rb')
+    wfile = connection.makefile('wb')
+    try:
+        for line in _request_lines(rfile):
+            response = handle_line(line, limits)
+            wfile.write((response + '\n').encode('utf-8'))
+            wfile.flush()
+    finally:
+        rfile.close()
+        wfile.close()
+        connection.close()
+
+
+def _worker(server, limits):
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    set_memory_limit(limits.max_memory)
+    while True:
+        connection, _ = server.accept()
+        try:
+            _serve_connection(connection, limits)
+        except socket.error:
+            # The client went away, wait for the next one.
+            continue
+
+
+def _spawn_worker(server, limits):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _worker(server, limits)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def _raise_system_exit(*args):
+    raise SystemExit(0)
+
+
+def serve_socket(socket_path, workers=1, limits=None):
+    """
+    Listen on the Unix socket ``socket_path`` with ``workers`` pre-forked
+    processes that all accept connections, each within ``limits``. Workers
+    that die are replaced. Stops on SIGTERM or SIGINT.
+    """
+    limits = limits or Limits()
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(SOCKET_BACKLOG)
+
+    children = set()
+    previous_handler = signal.signal(signal.SIGTERM, _raise_system_exit)
+    try:
+        for _ in range(max(workers, 1)):
+            children.add(_spawn_worker(server, limits))
+        while True:
+            pid, _ = os.wait()
+            children.discard(pid)
+            children.add(_spawn_worker(server, limits))
+    except (SystemExit, KeyboardInterrupt):
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        signal.signal(signal.SIGTERM, previous_handler)
+
+
+def main(argv=None):
+    parser = OptionParser(usage='%prog [options]')
+    parser.add_option('-s', '--socket', dest='socket_path',
+                      help='listen on this Unix socket instead of stdin')
+    parser.add_option('-w', '--workers', dest='workers', type='int',
+                      default=1,
+                      help='number of worker processes [default: %default]')
+    parser.add_option('--max-bytes', dest='max_bytes', type='int',
+                      help='refuse documents bigger than this uncompressed')
+    parser.add_option('--max-elements', dest='max_elements', type='int',
+                      help='refuse documents with more elements than this')
+    parser.add_option('--timeout', dest='timeout', type='float',
+                      help='seconds a conversion may take')
+    parser.add_option('--max-memory', dest='max_memory', type='int',
+                      help='bytes of memory each worker may use')
+    options, _ = parser.parse_args(argv)
+
+    limits = Limits(
+        max_bytes=options.max_bytes,
+        max_elements=options.max_elements,
+        timeout=options.timeout,
+        max_memory=options.max_memory,
+    )
+    _warm_up()
+    if options.socket_path:
+        serve_socket(options.socket_path, options.workers, limits)
+    else:
+        serve_stdio(workers=options.workers, limits=limits)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Differential testing of conversion engines.
+
+A conversion engine is any callable that takes a ``file_path`` and returns
+html, ``docx2html.convert`` is the ``legacy`` engine and is the reference the
+others are checked against. The html of both engines is normalized (blank
+text collapsed, attributes sorted) and compared block by block, the first
+block that differs is reported::
+
+    $ python -m docx2html.differential --engine NAME path/to/corpus
+
+Engines register themselves with ``register_engine``. Like ``convert`` the
+engines extract the images next to each docx, so run it on a copy of the
+corpus.
+"""
+import os
+import os.path
+import sys
+from collections import namedtuple
+from optparse import OptionParser
+
+from lxml import etree
+
+from docx2html.core import convert
+from docx2html.ir import convert_with_ir
+from docx2html.utils import collapse_html
+
+REFERENCE_ENGINE = 'legacy'
+CORPUS_EXTENSIONS = ('.docx',)
+
+
+def _convert_with_fragment_cache(file_path):
+    return convert(file_path, fragment_cache={})
+
+
+ENGINES = {
+    REFERENCE_ENGINE: convert,
+    'ir': convert_with_ir,
+    'fragments': _convert_with_fragment_cache,
+}
+
+Divergence = namedtuple('Divergence', ['index', 'expected', 'actual'])
+CheckResult = namedtuple(
+    'CheckResult',
+    ['file_path', 'engine', 'divergence', 'error'],
+)
+
+
+def register_engine(name, engine):
+    ENGINES[name] = engine
+
+
+def get_engine(name):
+    if name not in ENGINES:
+        raise KeyError('Unknown engine "%s", choose from: %s' % (
+            name,
+            ', '.join(sorted(ENGINES)),
+        ))
+    return ENGINES[name]
+
+
+def normalize_blocks(html):
+    """
+    Return the top level blocks of ``html`` as normalized strings.
+    """
+    parser = etree.HTMLParser(remove_blank_text=True)
+    root = etree.fromstring(collapse_html(html), parser)
+    if root is None:
+        return []
+    body = root.find('body')
+    if body is None:
+        return []
+    blocks = []
+    if body.text and body.text.strip():
+        blocks.append(body.text.strip())
+    for el in body:
+        for child in el.iter():
+            attributes = sorted(child.attrib.items())
+            child.attrib.clear()
+            for key, value in attributes:
+                child.set(key, value)
+        blocks.append(etree.tostring(el, method='html', with_tail=False))
+        if el.tail and el.tail.strip():
+            blocks.append(el.tail.strip())
+    return blocks
+
+
+def compare_html(expected_html, actual_html):
+    """
+    Return a ``Divergence`` for the first block that is not the same, or None
+    if both are equivalent. A missing block is reported as None.
+    """
+    expected = normalize_blocks(expected_html)
+    actual = normalize_blocks(actual_html)
+    for index in range(max(len(expected), len(actual))):
+        expected_block = None
+        actual_block = None
+        if index < len(expected):
+            expected_block = expected[index]
+        if index < len(actual):
+            actual_block = actual[index]
+        if expected_block != actual_block:
+            return Divergence(index, expected_block, actual_block)
+    return None
+
+
+def check_file(file_path, engine, reference=REFERENCE_ENGINE):
+    try:
+        expected_html = get_engine(reference)(file_path)
+        actual_html = get_engine(engine)(file_path)
+    except Exception as e:
+        return CheckResult(file_path, engine, None, e)
+    return CheckResult(
+        file_path,
+        engine,
+        compare_html(expected_html, actual_html),
+        None,
+    )
+
+
+def find_corpus_files(paths):
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for dirpath, _, filenames in os.walk(path):
+            for filename in sorted(filenames):
+                _, extension = os.path.splitext(filename)
+                if extension.lower() in CORPUS_EXTENSIONS:
+                    yield os.path.join(dirpath, filename)
+
+
+def check_corpus(paths, engine, reference=REFERENCE_ENGINE):
+    """
+    ``paths`` is a list of files and directories, directories are searched
+    for docx files. Yields a ``CheckResult`` per file.
+    """
+    for file_path in find_corpus_files(paths):
+        yield check_file(file_path, engine, reference)
+
+
+def format_result(result):
+    if result.error is not None:
+        return '%s: ERROR %r' % (result.file_path, result.error)
+    if result.divergence is None:
+        return '%s: OK' % result.file_path
+    return '%s: block %d differs\n  expected: %s\n  actual:   %s' % (
+        result.file_path,
+        result.divergence.index,
+        result.divergence.expected,
+        result.divergence.actual,
+    )
+
+
+def main(argv=None):
+    parser = OptionParser(usage='%prog [options] file_or_directory ...')
+    parser.add_option('-e', '--engine', dest='engine',
+                      help='engine to check (%s)' % ', '.join(sorted(ENGINES)))
+    parser.add_option('-r', '--reference', dest='reference',
+                      default=REFERENCE_ENGINE,
+                      help='engine to compare against [default: %default]')
+    options, paths = parser.parse_args(argv)
+    if not options.engine or not paths:
+        parser.error('an engine and at least one path are required')
+
+    failures = 0
+    for result in check_corpus(paths, options.engine, options.reference):
+        if result.error is not None or result.divergence is not None:
+            failures += 1
+        sys.stdout.write(format_result(result) + '\n')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -20,3 +20,7 @@ class UnintendedTag(Docx2HtmlException):
 
 class SyntaxNotSupported(Docx2HtmlException):
     pass
+
+
+class LimitExceeded(Docx2HtmlException):
+    pass
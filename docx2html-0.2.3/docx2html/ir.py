@@ -0,0 +1,176 @@
+"""
+An intermediate representation (IR) of converted documents.
+
+``build_ir`` parses and classifies a docx once (headers, paragraphs, lists
+with their levels, tables with their row and column spans, runs with their
+bold and italics) and keeps the result as nested lists. ``render_html`` turns
+it into the same html as ``convert`` without touching the docx again, so the
+same document can be rendered with another image handler, or only its first
+blocks for a preview, without parsing any XML::
+
+    ir = build_ir('path/to/docx/file')
+    with open('path/to/cache.json', 'w') as f:
+        dump_ir(ir, f)
+
+    with open('path/to/cache.json') as f:
+        html = render_html(load_ir(f), image_handler=handle_image)
+
+Every node is a list of ``[tag, attributes, text, tail, children]``, the
+attributes a list of ``[name, value]`` pairs. The ``src`` of images is the
+index of their image id in ``image_ids`` so it can be filled in when the IR
+is rendered. The IR keeps the paths of the extracted images, they have to
+still be there for the image handler.
+
+The IR is the html tree before serialization, the classification is done
+when it is built: which paragraphs are headers (and with ``DETECT_FONT_SIZE``
+which are headers because of their font size), how lists nest and where they
+end. Rendering it with other classification settings needs a new IR from
+the docx, only the image handler and ``max_blocks`` can change between
+renders.
+"""
+import json
+from collections import namedtuple
+from zipfile import BadZipfile
+
+from lxml import etree
+
+from docx2html.core import (
+    _get_document_data,
+    create_html_element,
+    get_zip_file_handler,
+    html_element_to_string,
+)
+from docx2html.exceptions import MalformedDocx
+
+# Bump this when the layout changes so that stored IRs are not misread.
+IR_VERSION = 1
+
+DocumentIR = namedtuple(
+    'DocumentIR',
+    ['blocks', 'image_ids', 'relationship_dict'],
+)
+
+
+class _ImageRecorder(object):
+    """
+    An image handler that gives every image a token as its ``src`` so the
+    images can be found in the html element.
+    """
+    def __init__(self):
+        self.image_ids = []
+        self.tokens = {}
+        self.relationship_dict = {}
+
+    def image_handler(self, image_id, relationship_dict):
+        self.relationship_dict = relationship_dict
+        token = 'docx2html-ir-image-%d' % len(self.image_ids)
+        self.tokens[token] = len(self.image_ids)
+        self.image_ids.append(image_id)
+        return token
+
+
+def _element_to_node(el, tokens):
+    attributes = []
+    for name, value in el.items():
+        if el.tag == 'img' and name == 'src' and value in tokens:
+            value = tokens[value]
+        attributes.append([name, value])
+    return [
+        el.tag,
+        attributes,
+        el.text,
+        el.tail,
+        [_element_to_node(child, tokens) for child in el],
+    ]
+
+
+def _node_to_element(node, parent, srcs):
+    tag, attributes, text, tail, children = node
+    el = etree.SubElement(parent, tag)
+    for name, value in attributes:
+        if isinstance(value, int):
+            value = srcs[value]
+        el.set(name, value)
+    el.text = text
+    el.tail = tail
+    for child in children:
+        _node_to_element(child, el, srcs)
+    return el
+
+
+def build_ir(file_path):
+    """
+    Parse the docx at ``file_path`` and return its ``DocumentIR``. Other
+    formats need to be converted to docx first.
+    """
+    try:
+        zf = get_zip_file_handler(file_path)
+    except BadZipfile:
+        raise MalformedDocx('This file is not a docx')
+    recorder = _ImageRecorder()
+    tree, meta_data = _get_document_data(zf, recorder.image_handler)
+    new_html = create_html_element(tree, meta_data)
+    return DocumentIR(
+        blocks=[_element_to_node(el, recorder.tokens) for el in new_html],
+        image_ids=recorder.image_ids,
+        relationship_dict=dict(recorder.relationship_dict),
+    )
+
+
+def _get_src(src):
+    # ``convert`` parses the img tag with the src in it, do the same so that
+    # entities in the src end up the same.
+    return etree.XML('<img src="%s" />' % src).get('src')
+
+
+def render_html(ir, image_handler=None, max_blocks=None):
+    """
+    Return the html for ``ir``. ``image_handler`` is the same as for
+    ``convert``, it is called once per image. With ``max_blocks`` only that
+    many top level blocks are rendered.
+    """
+    if image_handler is None:
+        def image_handler(image_id, relationship_dict):
+            return relationship_dict.get(image_id)
+
+    blocks = ir.blocks
+    if max_blocks is not None:
+        blocks = blocks[:max_blocks]
+    srcs = [
+        _get_src(image_handler(image_id, ir.relationship_dict))
+        for image_id in ir.image_ids
+    ]
+    new_html = etree.Element('html')
+    for node in blocks:
+        _node_to_element(node, new_html, srcs)
+    return html_element_to_string(new_html)
+
+
+def convert_with_ir(file_path, image_handler=None):
+    """
+    ``convert`` by way of ``build_ir`` and ``render_html``.
+    """
+    return render_html(build_ir(file_path), image_handler=image_handler)
+
+
+def dump_ir(ir, f):
+    """
+    Write ``ir`` to the file object ``f`` as json.
+    """
+    data = dict(ir._asdict())
+    data['version'] = IR_VERSION
+    json.dump(data, f, separators=(',', ':'))
+
+
+def load_ir(f):
+    """
+    Read an IR written by ``dump_ir`` from the file object ``f``.
+    """
+    data = json.load(f)
+    if data.get('version') != IR_VERSION:
+        raise ValueError('Unsupported IR version: %r' % data.get('version'))
+    return DocumentIR(
+        blocks=data['blocks'],
+        image_ids=data['image_ids'],
+        relationship_dict=data['relationship_dict'],
+    )
@@ -0,0 +1,194 @@
+"""
+Limits for converting documents that can not be trusted.
+
+A zip bomb or a document with a million table rows can keep a worker busy
+for minutes or use up its memory. ``convert_limited`` is ``convert`` that
+gives up with a ``LimitExceeded`` as soon as a document goes over one of its
+``Limits``:
+
+``max_bytes``
+    The total uncompressed size of the docx, from the zip directory. Checked
+    before anything is decompressed. A file that is not a docx is checked by
+    its size before it is converted, and the docx it is converted to is
+    checked as well.
+``max_elements``
+    The number of elements in ``document.xml``. Counted while it is streamed,
+    before the whole tree is built. For a file that is not a docx the docx
+    it is converted to is counted.
+``timeout``
+    Seconds the conversion may take. This uses ``SIGALRM``, so it only works
+    on the main thread of a process, and the parts of the docx are read on
+    that thread instead of on ``core.PARSE_THREADS`` threads.
+``max_memory``
+    Bytes of address space for the whole process, set once per worker
+    process with ``set_memory_limit``. Going over it raises a
+    ``MemoryError`` in the conversion that did.
+
+Every limit is optional. ``batch.convert_scheduled`` and ``docx2html.daemon``
+take ``limits`` and apply them to every job in their worker processes, a job
+that goes over a limit fails on its own and the worker goes on with the next
+one::
+
+    limits = Limits(max_bytes=200 * 1024 * 1024, timeout=60)
+    html = convert_limited('path/to/docx/file', limits)
+"""
+import os
+import signal
+from collections import namedtuple
+from contextlib import contextmanager
+from zipfile import ZipFile, BadZipfile
+
+from lxml import etree
+
+from docx2html import core
+from docx2html.core import convert
+from docx2html.exceptions import LimitExceeded
+
+Limits = namedtuple(
+    'Limits',
+    ['max_bytes', 'max_elements', 'timeout', 'max_memory'],
+)
+Limits.__new__.__defaults__ = (None, None, None, None)
+
+
+def check_size(file_path, max_bytes):
+    """
+    Raise ``LimitExceeded`` if the docx at ``file_path`` would take more than
+    ``max_bytes`` uncompressed. Files that are not docx are measured by their
+    size, missing files are left to the conversion.
+    """
+    try:
+        zf = ZipFile(file_path)
+    except BadZipfile:
+        size = os.path.getsize(file_path)
+    except (IOError, OSError):
+        return
+    else:
+        try:
+            size = sum(item.file_size for item in zf.infolist())
+        finally:
+            zf.close()
+    if size > max_bytes:
+        raise LimitExceeded(
+            'The document is %d bytes uncompressed, the limit is %d.' % (
+                size,
+                max_bytes,
+            )
+        )
+
+
+def check_elements(file_path, max_elements):
+    """
+    Raise ``LimitExceeded`` if ``document.xml`` of the docx at ``file_path``
+    has more than ``max_elements`` elements. Files that are not docx are
+    left alone.
+    """
+    try:
+        zf = ZipFile(file_path)
+    except (BadZipfile, IOError, OSError):
+        return
+    try:
+        try:
+            source = zf.open('word/document.xml')
+        except KeyError:
+            return
+        count = 0
+        try:
+            for _, el in etree.iterparse(source):
+                count += 1
+                if count > max_elements:
+                    raise LimitExceeded(
+                        'The document has more than %d elements.' % (
+                            max_elements,
+                        )
+                    )
+                # Only the count is needed, do not keep the tree.
+                el.clear()
+        except etree.XMLSyntaxError:
+            # Left for the conversion to report.
+            return
+        finally:
+            source.close()
+    finally:
+        zf.close()
+
+
+def set_memory_limit(max_memory):
+    """
+    Limit the address space of this process to ``max_memory`` bytes. Meant
+    to be called at the start of a worker process.
+    """
+    if max_memory is None:
+        return
+    # Only import it when it is used, it is not on every platform.
+    import resource
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        max_memory = min(max_memory, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (max_memory, hard))
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Raise ``LimitExceeded`` in the block if it takes longer than
+    ``seconds``.
+    """
+    if seconds is None:
+        yield
+        return
+
+    def handler(signum, frame):
+        raise LimitExceeded('The conversion took longer than %ss.' % seconds)
+
+    previous_handler = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+@contextmanager
+def _single_threaded(enabled=True):
+    # The alarm only interrupts the main thread, a part read on a thread of
+    # the pool would go on for as long as it takes.
+    if not enabled:
+        yield
+        return
+    parse_threads = core.PARSE_THREADS
+    core.PARSE_THREADS = 0
+    try:
+        yield
+    finally:
+        core.PARSE_THREADS = parse_threads
+
+
+def _check(file_path, limits):
+    if limits.max_bytes is not None:
+        check_size(file_path, limits.max_bytes)
+    if limits.max_elements is not None:
+        check_elements(file_path, limits.max_elements)
+
+
+def _checked_converter(converter, limits):
+    # Check the docx a file was converted to before it is read.
+    def checked_converter(docx_path, file_path):
+        converter(docx_path, file_path)
+        _check(docx_path, limits)
+    return checked_converter
+
+
+def convert_limited(file_path, limits, **kwargs):
+    """
+    ``convert`` ``file_path`` within ``limits`` (except ``max_memory``, see
+    ``set_memory_limit``). The keyword arguments are passed on to
+    ``convert``.
+    """
+    if kwargs.get('converter') is not None:
+        kwargs['converter'] = _checked_converter(kwargs['converter'], limits)
+    with _single_threaded(limits.timeout is not None):
+        with time_limit(limits.timeout):
+            _check(file_path, limits)
+            return convert(file_path, **kwargs)
@@ -0,0 +1,227 @@
+"""
+Memory profiling of conversions.
+
+Every docx is converted in phases (``open``, ``parse`` and ``render``). After
+each phase the peak RSS of the process (``ru_maxrss``) is recorded, with how
+much it grew during the phase and, when ``tracemalloc`` is available (python
+3.4+), the peak traced memory and the allocation sites that grew the most
+during the phase::
+
+    $ python -m docx2html.memory -o memory.json path/to/corpus
+
+Each file is converted in its own process so the peak RSS of one file does
+not hide another, pass ``--in-process`` to turn that off. Note that
+``tracemalloc`` only sees memory allocated by python, the memory held by
+lxml trees only shows up in the RSS.
+
+On python 2 there is no ``tracemalloc`` and only the RSS is reported. The
+peak RSS never goes down, so the growth of a phase is only meaningful while
+the process has not converted anything bigger, which is what converting each
+file in its own process is for.
+"""
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from optparse import OptionParser
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from docx2html.core import (
+    _get_document_data,
+    create_html,
+    get_zip_file_handler,
+)
+from docx2html.differential import find_corpus_files
+
+DEFAULT_TOP = 10
+
+
+def _peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # OS X reports bytes, everything else kilobytes.
+    if sys.platform == 'darwin':
+        peak /= 1024
+    return peak
+
+
+def _rss_kb():
+    # Only linux has a cheap way to get the current RSS.
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (IOError, OSError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+def _top_allocations(snapshot, previous, top):
+    allocations = []
+    for stat in snapshot.compare_to(previous, 'lineno')[:top]:
+        frame = stat.traceback[0]
+        allocations.append({
+            'site': '%s:%d' % (frame.filename, frame.lineno),
+            'size': stat.size,
+            'size_diff': stat.size_diff,
+            'count_diff': stat.count_diff,
+        })
+    return allocations
+
+
+class _PhaseRecorder(object):
+    def __init__(self, top):
+        self.top = top
+        self.phases = []
+        self.snapshot = None
+        self.start = None
+        self.start_peak = None
+
+    def __enter__(self):
+        if tracemalloc is not None:
+            tracemalloc.start()
+            self.snapshot = self._take_snapshot()
+        self.start = time.time()
+        self.start_peak = _peak_rss_kb()
+        return self
+
+    def __exit__(self, *args):
+        if tracemalloc is not None:
+            tracemalloc.stop()
+
+    def _take_snapshot(self):
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ))
+
+    def end_phase(self, name):
+        end = time.time()
+        peak = _peak_rss_kb()
+        phase = {
+            'name': name,
+            'seconds': end - self.start,
+            'rss_kb': _rss_kb(),
+            'peak_rss_kb': peak,
+            'peak_rss_growth_kb': peak - self.start_peak,
+        }
+        if tracemalloc is not None:
+            traced, traced_peak = tracemalloc.get_traced_memory()
+            snapshot = self._take_snapshot()
+            phase['traced_bytes'] = traced
+            phase['traced_peak_bytes'] = traced_peak
+            phase['top_allocations'] = _top_allocations(
+                snapshot,
+                self.snapshot,
+                self.top,
+            )
+            self.snapshot = snapshot
+            # reset_peak is only available in python 3.9+.
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+        self.phases.append(phase)
+        self.start = time.time()
+        self.start_peak = peak
+
+
+def profile_conversion(file_path, image_handler=None, top=DEFAULT_TOP):
+    """
+    Convert the docx at ``file_path`` in the current process and return the
+    memory used by each phase.
+    """
+    with _PhaseRecorder(top) as recorder:
+        zf = get_zip_file_handler(file_path)
+        recorder.end_phase('open')
+        tree, meta_data = _get_document_data(zf, image_handler)
+        recorder.end_phase('parse')
+        html = create_html(tree, meta_data)
+        recorder.end_phase('render')
+    return {
+        'file_path': file_path,
+        'html_bytes': len(html),
+        'tracemalloc': tracemalloc is not None,
+        'phases': recorder.phases,
+    }
+
+
+def _profile_conversion_safely(file_path, top):
+    try:
+        return profile_conversion(file_path, top=top)
+    except Exception as e:
+        return {
+            'file_path': file_path,
+            'error': repr(e),
+        }
+
+
+def profile_corpus(paths, top=DEFAULT_TOP, isolate=True):
+    """
+    ``paths`` is a list of files and directories, directories are searched
+    for docx files. Yields the result of ``profile_conversion`` per file,
+    conversions that fail have an ``error`` instead of ``phases``.
+    """
+    for file_path in find_corpus_files(paths):
+        if not isolate:
+            yield _profile_conversion_safely(file_path, top)
+            continue
+        pool = multiprocessing.Pool(processes=1)
+        try:
+            yield pool.apply(_profile_conversion_safely, (file_path, top))
+        finally:
+            pool.close()
+            pool.join()
+
+
+def format_result(result):
+    if 'error' in result:
+        return '%s: ERROR %s' % (result['file_path'], result['error'])
+    lines = [result['file_path']]
+    for phase in result['phases']:
+        line = '  %-8s %8.3fs peak rss %8dkB (%+dkB)' % (
+            phase['name'],
+            phase['seconds'],
+            phase['peak_rss_kb'],
+            phase['peak_rss_growth_kb'],
+        )
+        if 'traced_peak_bytes' in phase:
+            line += ' traced peak %8dkB' % (
+                phase['traced_peak_bytes'] // 1024)
+        lines.append(line)
+        for allocation in phase.get('top_allocations', []):
+            lines.append('    %+10dB %s' % (
+                allocation['size_diff'],
+                allocation['site'],
+            ))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = OptionParser(usage='%prog [options] file_or_directory ...')
+    parser.add_option('-o', '--out', dest='output',
+                      help='write the results as json to this file')
+    parser.add_option('-t', '--top', dest='top', type='int',
+                      default=DEFAULT_TOP,
+                      help='allocation sites to report per phase')
+    parser.add_option('--in-process', dest='isolate', action='store_false',
+                      default=True,
+                      help='do not convert each file in its own process')
+    options, paths = parser.parse_args(argv)
+    if not paths:
+        parser.error('at least one path is required')
+
+    results = []
+    for result in profile_corpus(paths, options.top, options.isolate):
+        sys.stderr.write(format_result(result) + '\n')
+        results.append(result)
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 1 if any('error' in result for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
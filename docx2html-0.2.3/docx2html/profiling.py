@@ -0,0 +1,139 @@
+"""
+Opt-in call profiling for the functions wrapped with
+``docx2html.core.ensure_tag``.
+
+Profile a block of code::
+
+    from docx2html import convert
+    from docx2html.profiling import profile
+
+    with profile() as profiler:
+        html = convert('path/to/docx/file')
+    print profiler.report()
+
+Or set the ``DOCX2HTML_PROFILE`` environment variable to profile the whole
+process, the report is written to stderr when the process exits.
+
+When profiling is off the only cost is a single ``None`` check per call.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class CallStats(object):
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.short_circuits = 0
+        self.total_time = 0.0
+
+    @property
+    def short_circuit_rate(self):
+        if not self.calls:
+            return 0.0
+        return float(self.short_circuits) / self.calls
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'short_circuits': self.short_circuits,
+            'short_circuit_rate': self.short_circuit_rate,
+            'total_time': self.total_time,
+        }
+
+
+class CallProfiler(object):
+    """
+    Collects a ``CallStats`` per wrapped function, keyed on the function name.
+    ``total_time`` is cumulative, it includes the time spent in any wrapped
+    function called from within. Calls on other threads (``PARSE_THREADS``)
+    are recorded as well, their times add up.
+    """
+    timer = staticmethod(time.time)
+
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+        # Recursive functions (get_element_content) should only add the time
+        # of the outermost call, on each thread.
+        self._local = threading.local()
+
+    def _get_depths(self):
+        depths = getattr(self._local, 'depths', None)
+        if depths is None:
+            depths = self._local.depths = {}
+        return depths
+
+    def record(self, f, has_valid_tag, args, kwargs):
+        name = f.__name__
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = CallStats(name)
+            stats.calls += 1
+            if not has_valid_tag:
+                stats.short_circuits += 1
+                return None
+        depths = self._get_depths()
+        depths[name] = depths.get(name, 0) + 1
+        start = self.timer()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            depths[name] -= 1
+            if depths[name] == 0:
+                elapsed = self.timer() - start
+                with self._lock:
+                    stats.total_time += elapsed
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+    def sorted_stats(self):
+        return sorted(
+            self.stats.values(),
+            key=lambda s: s.total_time,
+            reverse=True,
+        )
+
+    def report(self):
+        lines = [
+            '%-32s %10s %10s %12s' % (
+                'function',
+                'calls',
+                'wrong tag',
+                'cum. time',
+            ),
+        ]
+        for stats in self.sorted_stats():
+            lines.append('%-32s %10d %9.1f%% %11.4fs' % (
+                stats.name,
+                stats.calls,
+                stats.short_circuit_rate * 100,
+                stats.total_time,
+            ))
+        return '\n'.join(lines)
+
+    def write_report(self, f):
+        if self.stats:
+            f.write(self.report() + '\n')
+
+
+@contextmanager
+def profile(profiler=None):
+    """
+    Profile every ``ensure_tag`` wrapped function for the duration of the
+    block. Yields the ``CallProfiler`` that holds the results.
+    """
+    from docx2html import core
+    if profiler is None:
+        profiler = CallProfiler()
+    previous = core.PROFILER
+    core.PROFILER = profiler
+    try:
+        yield profiler
+    finally:
+        core.PROFILER = previous
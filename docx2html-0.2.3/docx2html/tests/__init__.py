@@ -1,10 +1,10 @@
 from unittest import TestCase
-import re
 
 from docx2html.core import (
     MetaData,
     create_html,
 )
+from docx2html.utils import collapse_html
 
 
 def assert_html_equal(actual_html, expected_html):
@@ -15,43 +15,6 @@ def assert_html_equal(actual_html, expected_html):
     ), actual_html
 
 
-def collapse_html(html):
-    """
-    Remove insignificant whitespace from the html.
-
-    >>> print collapse_html('''\\
-    ...     <h1>
-    ...         Heading
-    ...     </h1>
-    ... ''')
-    <h1>Heading</h1>
-    >>> print collapse_html('''\\
-    ...     <p>
-    ...         Paragraph with
-    ...         multiple lines.
-    ...     </p>
-    ... ''')
-    <p>Paragraph with multiple lines.</p>
-    """
-    def smart_space(match):
-        # Put a space in between lines, unless exactly one side of the line
-        # break butts up against a tag.
-        before = match.group(1)
-        after = match.group(2)
-        space = ' '
-        if before == '>' or after == '<':
-            space = ''
-        return before + space + after
-    # Replace newlines and their surrounding whitespace with a single space (or
-    # empty string)
-    html = re.sub(
-        r'(>?)\s*\n\s*(<?)',
-        smart_space,
-        html,
-    )
-    return html.strip()
-
-
 DEFAULT_NUMBERING_DICT = {
     '1': {
         0: 'decimal',
@@ -0,0 +1,472 @@
+"""
+Benchmarks for docx2html built on ``DocxBuilder``.
+
+Documents are generated from a few parameters (number of paragraphs, list
+items and list depth, table rows and columns, number of images, line breaks,
+nested tables and paragraphs split into many runs) so the same cases can be
+run against different releases.
+Every case is run in its own process so that the peak memory of one case does
+not leak into the next::
+
+    $ python -m docx2html.tests.benchmark -o results.json
+    $ python -m docx2html.tests.benchmark --case tables --repeat 10
+    $ python -m docx2html.tests.benchmark --paragraphs 5000 --images 50
+    $ python -m docx2html.tests.benchmark --compare old_results.json
+"""
+import json
+import multiprocessing
+import os
+import os.path
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from io import BytesIO
+from optparse import OptionParser
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from PIL import Image
+
+from docx2html import VERSION, convert
+from docx2html.core import (
+    _get_document_data,
+    create_html,
+    get_zip_file_handler,
+)
+from docx2html.tests.document_builder import DocxBuilder as DXB
+
+DEFAULT_REPEAT = 3
+IMAGE_SIZE = 16
+
+# Every list level alternates between an ordered and an unordered list.
+LIST_FORMATS = ['decimal', 'bullet', 'lowerLetter', 'bullet', 'upperLetter',
+                'bullet', 'lowerRoman', 'bullet', 'decimal']
+
+Case = namedtuple(
+    'Case',
+    [
+        'name',
+        'paragraphs',
+        'list_items',
+        'list_depth',
+        'table_rows',
+        'table_columns',
+        'images',
+        'line_breaks',
+        'nested_tables',
+        'split_runs',
+    ],
+)
+
+
+def make_case(name, paragraphs=0, list_items=0, list_depth=1, table_rows=0,
+              table_columns=0, images=0, line_breaks=0, nested_tables=0,
+              split_runs=0):
+    return Case(
+        name=name,
+        paragraphs=paragraphs,
+        list_items=list_items,
+        list_depth=list_depth,
+        table_rows=table_rows,
+        table_columns=table_columns,
+        images=images,
+        line_breaks=line_breaks,
+        nested_tables=nested_tables,
+        split_runs=split_runs,
+    )
+
+
+CASES = [
+    make_case('paragraphs', paragraphs=2000),
+    make_case('lists', list_items=1000, list_depth=4),
+    make_case('tables', table_rows=300, table_columns=6),
+    make_case('images', paragraphs=20, images=40),
+    make_case('split_runs', split_runs=1000),
+    make_case(
+        'mixed',
+        paragraphs=500,
+        list_items=200,
+        list_depth=3,
+        table_rows=50,
+        table_columns=4,
+        images=10,
+    ),
+]
+
+
+###
+# Document generation
+###
+
+
+def _image_id(index):
+    return 'rId%d' % (index + 100)
+
+
+def _merged_table(num_rows, num_columns):
+    """
+    The first column is merged vertically in pairs of rows (vMerge) and every
+    third row spans its second and third column (gridSpan).
+    """
+    table_rows = []
+    for row in range(num_rows):
+        if row % 2 == 0:
+            v_merge = 'restart'
+        else:
+            v_merge = 'continue'
+        table_cells = [
+            DXB.table_cell([DXB.p_tag('Row %d' % row)], v_merge=v_merge),
+        ]
+        column = 1
+        while column < num_columns:
+            grid_span = None
+            if row % 3 == 0 and column + 1 < num_columns:
+                grid_span = 2
+            table_cells.append(DXB.table_cell(
+                [DXB.p_tag('Cell %d %d' % (row, column))],
+                grid_span=grid_span,
+            ))
+            column += grid_span or 1
+        table_rows.append(DXB.table_row(table_cells))
+    return DXB.table_from_rows(table_rows)
+
+
+def _split_runs_p_tag(index):
+    """
+    A paragraph split into a run per word, the way Word splits text for spell
+    checking and revisions. Most neighbouring runs share their formatting.
+    """
+    words = ('Paragraph %d is split into a run for every word of '
+             'its text.' % index).split()
+    return DXB.p_tag([
+        DXB.r_tag(word + ' ', is_bold=i < len(words) // 2)
+        for i, word in enumerate(words)
+    ])
+
+
+def _nested_tables(num_rows):
+    """
+    A single column table, every row holds a 2x2 table.
+    """
+    table_rows = []
+    for row in range(num_rows):
+        nested_table = DXB.table_from_rows([
+            DXB.table_row([
+                DXB.table_cell([DXB.p_tag('Nested %d %d %d' % (row, i, j))])
+                for j in range(2)
+            ])
+            for i in range(2)
+        ])
+        table_rows.append(DXB.table_row([
+            DXB.table_cell([DXB.p_tag('Row %d' % row), nested_table]),
+        ]))
+    return DXB.table_from_rows(table_rows)
+
+
+def build_document_xml(case):
+    body = []
+    for i in range(case.paragraphs):
+        body.append(DXB.p_tag(
+            'This is paragraph number %d of the benchmark document.' % i,
+        ))
+    for i in range(case.list_items):
+        body.append(DXB.li(
+            text='List item %d' % i,
+            ilvl=i % case.list_depth,
+            numId=1,
+        ))
+    if case.table_rows and case.table_columns:
+        body.append(_merged_table(case.table_rows, case.table_columns))
+    for i in range(case.images):
+        body.append(DXB.drawing(
+            _image_id(i),
+            width=IMAGE_SIZE,
+            height=IMAGE_SIZE,
+        ))
+    if case.line_breaks:
+        # A single paragraph with a line break after every run.
+        body.append(DXB.p_tag([
+            DXB.r_tag('Line %d' % i, include_linebreak=True)
+            for i in range(case.line_breaks)
+        ]))
+    if case.nested_tables:
+        body.append(_nested_tables(case.nested_tables))
+    for i in range(case.split_runs):
+        body.append(_split_runs_p_tag(i))
+    return DXB.xml(''.join(body))
+
+
+def _image_data(index):
+    # Give every image its own colour so that no two images are identical.
+    color = (index * 37 % 256, index * 91 % 256, index * 53 % 256)
+    image = Image.new('RGB', (IMAGE_SIZE, IMAGE_SIZE), color)
+    data = BytesIO()
+    image.save(data, 'PNG')
+    return data.getvalue()
+
+
+def build_docx(case, file_path):
+    """
+    Write a docx for ``case`` to ``file_path``.
+    """
+    numbering_dict = {
+        '1': dict(enumerate(LIST_FORMATS)),
+    }
+    relationships = [
+        ('rId1', 'styles', 'styles.xml'),
+        ('rId2', 'numbering', 'numbering.xml'),
+    ]
+    for i in range(case.images):
+        relationships.append(
+            (_image_id(i), 'image', 'media/image%d.png' % i),
+        )
+    styles = [DXB.style('Normal', 'Normal')]
+
+    zf = ZipFile(file_path, 'w', ZIP_DEFLATED)
+    try:
+        zf.writestr(
+            'word/document.xml',
+            build_document_xml(case).encode('utf-8'),
+        )
+        zf.writestr(
+            'word/numbering.xml',
+            DXB.numbering_xml(numbering_dict).encode('utf-8'),
+        )
+        zf.writestr(
+            'word/styles.xml',
+            DXB.styles_xml(styles).encode('utf-8'),
+        )
+        zf.writestr(
+            'word/_rels/document.xml.rels',
+            DXB.relationships_xml(relationships).encode('utf-8'),
+        )
+        for i in range(case.images):
+            zf.writestr('word/media/image%d.png' % i, _image_data(i))
+    finally:
+        zf.close()
+    return file_path
+
+
+###
+# Measuring
+###
+
+
+def _peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # OS X reports bytes, everything else kilobytes.
+    if sys.platform == 'darwin':
+        peak /= 1024
+    return peak
+
+
+def _timings(times, blocks):
+    best = min(times)
+    result = {
+        'best': best,
+        'median': sorted(times)[len(times) // 2],
+        'documents_per_second': None,
+        'blocks_per_second': None,
+    }
+    if best:
+        result['documents_per_second'] = 1 / best
+        result['blocks_per_second'] = blocks / best
+    return result
+
+
+def measure_case(case, repeat=DEFAULT_REPEAT):
+    """
+    Time ``create_html`` on its own (the zip is read and parsed outside of
+    the timer) and the full ``convert`` for ``case`` in the current process.
+    """
+    blocks = (
+        case.paragraphs +
+        case.list_items +
+        case.table_rows +
+        case.images +
+        case.line_breaks +
+        case.nested_tables +
+        case.split_runs
+    )
+    dp = tempfile.mkdtemp()
+    try:
+        file_path = build_docx(case, os.path.join(dp, '%s.docx' % case.name))
+        zf = get_zip_file_handler(file_path)
+        document_xml_bytes = zf.getinfo('word/document.xml').file_size
+        zf.close()
+
+        create_html_times = []
+        for _ in range(repeat):
+            tree, meta_data = _get_document_data(
+                get_zip_file_handler(file_path),
+            )
+            start = time.time()
+            html = create_html(tree, meta_data)
+            create_html_times.append(time.time() - start)
+
+        convert_times = []
+        for _ in range(repeat):
+            start = time.time()
+            convert(file_path)
+            convert_times.append(time.time() - start)
+    finally:
+        shutil.rmtree(dp)
+
+    return {
+        'case': case._asdict(),
+        'blocks': blocks,
+        'document_xml_bytes': document_xml_bytes,
+        'html_bytes': len(html),
+        'create_html': _timings(create_html_times, blocks),
+        'convert': _timings(convert_times, blocks),
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+
+
+def run_case(case, repeat=DEFAULT_REPEAT):
+    """
+    Run ``measure_case`` in a fresh process so that ``peak_rss_kb`` only
+    covers ``case``.
+    """
+    pool = multiprocessing.Pool(processes=1)
+    try:
+        return pool.apply(measure_case, (case, repeat))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def run_benchmarks(cases=None, repeat=DEFAULT_REPEAT):
+    if cases is None:
+        cases = CASES
+    return {
+        'docx2html_version': VERSION,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': repeat,
+        'results': [run_case(case, repeat) for case in cases],
+    }
+
+
+def compare_results(old, new):
+    """
+    Return a line per case found in both ``old`` and ``new`` with the ratio
+    of the best ``convert`` times, below 1 is faster, and the ratios of the
+    peak memory and the size of the html.
+    """
+    old_results = dict(
+        (result['case']['name'], result) for result in old['results']
+    )
+    lines = ['%-16s %12s %12s %8s %12s %12s' % (
+        'case', 'old', 'new', 'ratio', 'rss ratio', 'html ratio',
+    )]
+    for result in new['results']:
+        name = result['case']['name']
+        if name not in old_results:
+            continue
+        old_result = old_results[name]
+        old_time = old_result['convert']['best']
+        new_time = result['convert']['best']
+        old_html_bytes = old_result.get('html_bytes')
+        lines.append('%-16s %11.4fs %11.4fs %8.2f %12.2f %12.2f' % (
+            name,
+            old_time,
+            new_time,
+            new_time / old_time if old_time else 0,
+            float(result['peak_rss_kb']) / old_result['peak_rss_kb'],
+            (
+                float(result.get('html_bytes', 0)) / old_html_bytes
+                if old_html_bytes else 0
+            ),
+        ))
+    return '\n'.join(lines)
+
+
+def summarize(results):
+    lines = ['%-16s %12s %12s %14s %12s %12s' % (
+        'case', 'create_html', 'convert', 'blocks/s', 'peak rss', 'html',
+    )]
+    for result in results['results']:
+        lines.append('%-16s %11.4fs %11.4fs %14.0f %10dkB %11dB' % (
+            result['case']['name'],
+            result['create_html']['best'],
+            result['convert']['best'],
+            result['convert']['blocks_per_second'] or 0,
+            result['peak_rss_kb'],
+            result['html_bytes'],
+        ))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = OptionParser(usage='%prog [options]')
+    parser.add_option('-o', '--out', dest='output',
+                      help='write the results as json to this file')
+    parser.add_option('-c', '--case', dest='cases', action='append',
+                      help='only run this case (%s)' % ', '.join(
+                          case.name for case in CASES))
+    parser.add_option('-r', '--repeat', dest='repeat', type='int',
+                      default=DEFAULT_REPEAT)
+    parser.add_option('--compare', dest='compare',
+                      help='json results of an earlier run to compare with')
+    parser.add_option('--paragraphs', type='int', default=0)
+    parser.add_option('--list-items', dest='list_items', type='int',
+                      default=0)
+    parser.add_option('--list-depth', dest='list_depth', type='int',
+                      default=1)
+    parser.add_option('--table-rows', dest='table_rows', type='int',
+                      default=0)
+    parser.add_option('--table-columns', dest='table_columns', type='int',
+                      default=0)
+    parser.add_option('--images', type='int', default=0)
+    parser.add_option('--line-breaks', dest='line_breaks', type='int',
+                      default=0)
+    parser.add_option('--nested-tables', dest='nested_tables', type='int',
+                      default=0)
+    parser.add_option('--split-runs', dest='split_runs', type='int',
+                      default=0)
+    options, _ = parser.parse_args(argv)
+
+    cases = CASES
+    if options.cases:
+        cases = [case for case in CASES if case.name in options.cases]
+    if any((
+            options.paragraphs,
+            options.list_items,
+            options.table_rows,
+            options.images,
+            options.line_breaks,
+            options.nested_tables,
+            options.split_runs)):
+        cases = [make_case(
+            'custom',
+            paragraphs=options.paragraphs,
+            list_items=options.list_items,
+            list_depth=options.list_depth,
+            table_rows=options.table_rows,
+            table_columns=options.table_columns,
+            images=options.images,
+            line_breaks=options.line_breaks,
+            nested_tables=options.nested_tables,
+            split_runs=options.split_runs,
+        )]
+
+    results = run_benchmarks(cases, options.repeat)
+    sys.stderr.write(summarize(results) + '\n')
+    if options.compare:
+        with open(options.compare) as f:
+            sys.stderr.write(compare_results(json.load(f), results) + '\n')
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
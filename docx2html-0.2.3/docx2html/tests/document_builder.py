@@ -1,13 +1,17 @@
 from jinja2 import Environment, PackageLoader
 
+from docx2html.core import EMUS_PER_PIXEL
+
 templates = {
     'drawing': 'drawing.xml',
     'hyperlink': 'hyperlink.xml',
     'insert': 'insert.xml',
     'main': 'base.xml',
+    'numbering': 'numbering.xml',
     'p': 'p.xml',
     'pict': 'pict.xml',
     'r': 'r.xml',
+    'relationships': 'relationships.xml',
     'sectPr': 'sectPr.xml',
     'smartTag': 'smart_tag.xml',
     'style': 'style.xml',
@@ -122,9 +126,36 @@ class DocxBuilder(object):
         return template.render(table_rows=trs)
 
     @classmethod
-    def drawing(self, r_id):
+    def table_cell(self, p_tags, grid_span=None, v_merge=None):
+        template = env.get_template(templates['tc'])
+
+        kwargs = {
+            'p_tag': p_tags,
+            'grid_span': grid_span,
+            'v_merge': v_merge,
+        }
+        return template.render(**kwargs)
+
+    @classmethod
+    def table_row(self, table_cells):
+        template = env.get_template(templates['tr'])
+        return template.render(table_cells=table_cells)
+
+    @classmethod
+    def table_from_rows(self, table_rows):
+        template = env.get_template(templates['table'])
+        return template.render(table_rows=table_rows)
+
+    @classmethod
+    def drawing(self, r_id, width=4, height=4):
         template = env.get_template(templates['drawing'])
-        return template.render(r_id=r_id)
+
+        kwargs = {
+            'r_id': r_id,
+            'cx': width * EMUS_PER_PIXEL,
+            'cy': height * EMUS_PER_PIXEL,
+        }
+        return template.render(**kwargs)
 
     @classmethod
     def pict(self, r_id=None):
@@ -159,3 +190,26 @@ class DocxBuilder(object):
         }
 
         return template.render(**kwargs)
+
+    @classmethod
+    def numbering_xml(self, numbering_dict):
+        """
+        ``numbering_dict`` has the same shape as the result of
+        ``get_numbering_info``, the numId is reused as the abstractNumId.
+        """
+        template = env.get_template(templates['numbering'])
+
+        numbering = [
+            (num_id, sorted(levels.items()))
+            for num_id, levels in sorted(numbering_dict.items())
+        ]
+        return template.render(numbering=numbering)
+
+    @classmethod
+    def relationships_xml(self, relationships):
+        """
+        ``relationships`` is a list of (r_id, relationship_type, target), eg.
+        ('rId1', 'image', 'media/image1.png')
+        """
+        template = env.get_template(templates['relationships'])
+        return template.render(relationships=relationships)
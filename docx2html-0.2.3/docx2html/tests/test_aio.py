@@ -0,0 +1,105 @@
+import shutil
+import tempfile
+from os import path
+from unittest import TestCase
+
+from nose.plugins.skip import SkipTest
+
+from docx2html import aio
+from docx2html.aio import convert_async
+from docx2html.core import convert
+from docx2html.tests.benchmark import build_docx, make_case
+
+IMAGES = 6
+
+
+class ConvertAsyncTestCase(TestCase):
+    def setUp(self):
+        if aio.asyncio is None:
+            raise SkipTest('asyncio is not available')
+        self.loop = aio.asyncio.new_event_loop()
+        self.dp = tempfile.mkdtemp()
+        self.file_path = path.join(self.dp, 'images.docx')
+        build_docx(
+            make_case('images', paragraphs=2, images=IMAGES),
+            self.file_path,
+        )
+
+    def tearDown(self):
+        self.loop.close()
+        shutil.rmtree(self.dp)
+
+    def _delayed_handler(self, stats):
+        # Returns a future that resolves a little later, without using any
+        # coroutine syntax so this works with asyncio and trollius.
+        def image_handler(image_id, relationship_dict):
+            stats['calls'] += 1
+            stats['pending'] += 1
+            stats['max_pending'] = max(stats['max_pending'], stats['pending'])
+            future = aio.asyncio.Future(loop=self.loop)
+
+            def resolve():
+                stats['pending'] -= 1
+                future.set_result('/uploaded/%s' % image_id)
+            self.loop.call_later(0.01, resolve)
+            return future
+        return image_handler
+
+    def _convert(self, **kwargs):
+        return self.loop.run_until_complete(convert_async(
+            self.file_path,
+            loop=self.loop,
+            **kwargs
+        ))
+
+    def test_matches_convert(self):
+        def image_handler(image_id, relationship_dict):
+            return '/uploaded/%s' % image_id
+
+        expected = convert(self.file_path, image_handler=image_handler)
+        stats = {'calls': 0, 'pending': 0, 'max_pending': 0}
+        actual = self._convert(image_handler=self._delayed_handler(stats))
+        assert actual == expected
+        assert stats['calls'] == IMAGES
+
+    def test_matches_convert_src(self):
+        # Not ascii, and with a character that the void element hack in
+        # convert does not match.
+        for src in (u'/caf\xe9', '/uploaded?id=1'):
+            def image_handler(image_id, relationship_dict):
+                return src
+
+            def delayed_handler(image_id, relationship_dict):
+                future = aio.asyncio.Future(loop=self.loop)
+                self.loop.call_soon(future.set_result, src)
+                return future
+
+            expected = convert(self.file_path, image_handler=image_handler)
+            actual = self._convert(image_handler=delayed_handler)
+            assert actual == expected, src
+            assert type(actual) is type(expected)
+
+    def test_concurrency_limit(self):
+        stats = {'calls': 0, 'pending': 0, 'max_pending': 0}
+        self._convert(
+            image_handler=self._delayed_handler(stats),
+            concurrency=2,
+        )
+        assert stats['calls'] == IMAGES
+        assert stats['max_pending'] == 2
+
+    def test_default_image_handler(self):
+        assert self._convert() == convert(self.file_path)
+
+    def test_image_handler_error(self):
+        def image_handler(image_id, relationship_dict):
+            future = aio.asyncio.Future(loop=self.loop)
+            future.set_exception(IOError('upload failed'))
+            return future
+
+        try:
+            self._convert(image_handler=image_handler)
+        except IOError as e:
+            assert str(e) == 'upload failed'
+        else:
+            raise AssertionError('IOError not raised')
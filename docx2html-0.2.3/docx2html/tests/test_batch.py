@@ -0,0 +1,196 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from os import path
+from unittest import TestCase
+
+from docx2html.batch import (
+    Profile,
+    convert_pipelined,
+    convert_scheduled,
+    get_profile,
+    schedule,
+)
+from docx2html.core import convert
+from docx2html.exceptions import ConversionFailed
+
+FIXTURES = path.join(path.abspath(path.dirname(__file__)), '..', 'fixtures')
+
+
+def _die(docx_path, file_path):
+    # A converter that takes its worker process down.
+    os._exit(1)
+
+
+class ConvertPipelinedTestCase(TestCase):
+    def setUp(self):
+        self.dp = tempfile.mkdtemp()
+        self.lock = threading.Lock()
+        self.converted = []
+
+    def tearDown(self):
+        shutil.rmtree(self.dp)
+
+    def _file(self, name, fixture='simple.docx'):
+        file_path = path.join(self.dp, name)
+        shutil.copyfile(path.join(FIXTURES, fixture), file_path)
+        return file_path
+
+    def converter(self, docx_path, file_path):
+        # "Converts" a docx with another extension, slowly.
+        time.sleep(0.01)
+        if 'broken' not in file_path:
+            shutil.copyfile(file_path, docx_path)
+        with self.lock:
+            self.converted.append(file_path)
+
+    def test_matches_convert(self):
+        file_paths = [
+            self._file('one.doc'),
+            self._file('two.docx', 'nested_tables.docx'),
+            self._file('three.rtf', 'has_title.docx'),
+        ]
+        results = list(convert_pipelined(file_paths, converter=self.converter))
+        assert [r.file_path for r in results] == file_paths
+        assert [r.error for r in results] == [None] * 3
+        expected = [
+            convert(path.join(FIXTURES, 'simple.docx')),
+            convert(file_paths[1]),
+            convert(path.join(FIXTURES, 'has_title.docx')),
+        ]
+        assert [r.html for r in results] == expected
+        # The docx is not converted again.
+        assert sorted(self.converted) == sorted(
+            [file_paths[0], file_paths[2]],
+        )
+
+    def test_failures(self):
+        file_paths = [
+            self._file('broken.doc'),
+            self._file('second.doc'),
+            self._file('fine.doc'),
+        ]
+
+        def fall_back(file_path):
+            return '<html>fall back</html>'
+
+        results = list(convert_pipelined(
+            file_paths[:1],
+            converter=self.converter,
+            fall_back=fall_back,
+        ))
+        assert results[0].html == '<html>fall back</html>'
+
+        results = list(convert_pipelined(file_paths, converter=self.converter))
+        assert isinstance(results[0].error, ConversionFailed)
+        assert results[1].error is None
+        assert results[2].error is None
+
+    def test_queue_size(self):
+        file_paths = [self._file('%d.doc' % i) for i in range(8)]
+        done = 0
+        for result in convert_pipelined(
+                file_paths,
+                converter=self.converter,
+                queue_size=2):
+            assert result.error is None
+            done += 1
+            # Give the converters a chance to run ahead.
+            time.sleep(0.05)
+            # Never more than the one being parsed and two more.
+            with self.lock:
+                assert len(self.converted) <= done + 2
+        assert done == 8
+
+
+class ScheduleTestCase(TestCase):
+    def setUp(self):
+        self.dp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dp)
+
+    def test_get_profile(self):
+        file_path = path.join(FIXTURES, 'has_image.docx')
+        profile = get_profile(file_path)
+        assert profile.document_bytes > 0
+        assert profile.media_count == 1
+        assert profile.media_bytes > 0
+        assert 'word/document.xml' in profile.parts
+        assert profile.cost > 0
+
+        file_path = path.join(self.dp, 'not_a_docx.doc')
+        with open(file_path, 'wb') as f:
+            f.write(b'x' * 100)
+        profile = get_profile(file_path)
+        assert profile.document_bytes == 100
+        assert profile.parts == []
+
+    def test_schedule(self):
+        profiles = [
+            Profile('big', 0, 0, 0, [], 10),
+            Profile('medium', 0, 0, 0, [], 2),
+            Profile('small', 0, 0, 0, [], 1),
+            Profile('huge', 0, 0, 0, [], 50),
+        ]
+        small, big = schedule(profiles, big_cost=5)
+        assert [p.file_path for p in small] == ['small', 'medium']
+        assert [p.file_path for p in big] == ['big', 'huge']
+
+    def test_convert_scheduled(self):
+        file_paths = []
+        filenames = ('simple.docx', 'nested_tables.docx', 'has_title.docx')
+        for filename in filenames:
+            file_path = path.join(self.dp, filename)
+            shutil.copyfile(path.join(FIXTURES, filename), file_path)
+            file_paths.append(file_path)
+        file_paths.append(path.join(self.dp, 'missing.docx'))
+        # Put the biggest one in a lane of its own.
+        costs = sorted(get_profile(p).cost for p in file_paths)
+        results = list(convert_scheduled(
+            file_paths,
+            workers=1,
+            big_workers=1,
+            big_cost=costs[-2],
+        ))
+        assert sorted(r.file_path for r in results) == sorted(file_paths)
+        for result in results:
+            if result.file_path.endswith('missing.docx'):
+                assert result.error is not None
+            else:
+                assert result.error is None
+                assert result.html == convert(result.file_path)
+
+    def test_costs(self):
+        # A bigger document.xml costs more.
+        small = get_profile(path.join(FIXTURES, 'simple.docx'))
+        big = get_profile(path.join(FIXTURES, 'nested_tables.docx'))
+        assert small.document_bytes < big.document_bytes
+        assert small.cost < big.cost
+
+    def test_convert_scheduled_unpicklable(self):
+        file_path = path.join(FIXTURES, 'simple.docx')
+        results = list(convert_scheduled(
+            [file_path],
+            workers=1,
+            image_handler=lambda image_id, relationship_dict: 'x',
+        ))
+        assert len(results) == 1
+        assert results[0].file_path == file_path
+        assert results[0].error is not None
+
+    def test_convert_scheduled_worker_died(self):
+        dying = path.join(self.dp, 'dying.doc')
+        shutil.copyfile(path.join(FIXTURES, 'simple.docx'), dying)
+        simple = path.join(FIXTURES, 'simple.docx')
+        results = list(convert_scheduled(
+            [dying, simple],
+            workers=1,
+            converter=_die,
+        ))
+        results = dict((r.file_path, r) for r in results)
+        assert isinstance(results[dying].error, ConversionFailed)
+        # The pool started a new worker for the next file.
+        assert results[simple].html == convert(simple)
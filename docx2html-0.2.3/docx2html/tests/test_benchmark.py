@@ -0,0 +1,63 @@
+import shutil
+import tempfile
+from os import path
+
+from docx2html import convert
+from docx2html.tests.benchmark import (
+    build_docx,
+    compare_results,
+    make_case,
+    measure_case,
+)
+
+SMALL_CASE = make_case(
+    'small',
+    paragraphs=2,
+    list_items=4,
+    list_depth=2,
+    table_rows=4,
+    table_columns=4,
+    images=2,
+)
+
+
+def test_build_docx():
+    dp = tempfile.mkdtemp()
+    try:
+        file_path = build_docx(SMALL_CASE, path.join(dp, 'small.docx'))
+        html = convert(file_path)
+    finally:
+        shutil.rmtree(dp)
+
+    assert html.count('<p>') == 2 + 2, html
+    assert html.count('<li>') == 4, html
+    assert '<ol data-list-type="decimal">' in html, html
+    assert '<ul>' in html, html
+    assert html.count('<tr>') == 4, html
+    assert html.count('rowspan="2"') == 2, html
+    assert html.count('colspan="2"') == 2, html
+    assert html.count('height="16" width="16"') == 2, html
+
+
+def test_measure_case():
+    result = measure_case(SMALL_CASE, repeat=1)
+    assert result['case']['name'] == 'small'
+    assert result['blocks'] == 12
+    assert result['html_bytes'] > 0
+    assert result['document_xml_bytes'] > 0
+    assert result['peak_rss_kb'] > 0
+    for key in ('create_html', 'convert'):
+        assert result[key]['best'] >= 0
+        assert 'documents_per_second' in result[key]
+
+
+def test_compare_results():
+    def _results(best):
+        return {'results': [{
+            'case': {'name': 'small'},
+            'convert': {'best': best},
+            'peak_rss_kb': 100,
+        }]}
+    lines = compare_results(_results(2.0), _results(1.0)).splitlines()
+    assert len(lines) == 2
+    assert lines[1].split()[3] == '0.50'
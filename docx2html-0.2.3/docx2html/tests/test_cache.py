@@ -0,0 +1,40 @@
+import threading
+
+from docx2html.cache import LRUCache
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    # Using 'a' makes 'b' the least recently used.
+    assert cache['a'] == 1
+    cache['c'] = 3
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_lru_cache_threads():
+    cache = LRUCache(10)
+
+    def fill(offset):
+        for i in range(1000):
+            cache[offset + i] = i
+            cache.get(offset + i - 5)
+    threads = [
+        threading.Thread(target=fill, args=(offset,))
+        for offset in range(0, 4000, 1000)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 10
@@ -0,0 +1,86 @@
+import gzip
+import hashlib
+import io
+import shutil
+import tempfile
+from os import path
+
+from nose.plugins.skip import SkipTest
+from nose.tools import assert_raises
+
+from docx2html import compression
+from docx2html.compression import CompressedWriter, write_compressed
+from docx2html.core import convert, iter_html
+
+
+def _fixture(dp, filename):
+    # Images are extracted next to the docx, convert a copy.
+    file_path = path.join(dp, filename)
+    shutil.copyfile(
+        path.join(
+            path.abspath(path.dirname(__file__)),
+            '..',
+            'fixtures',
+            filename,
+        ),
+        file_path,
+    )
+    return file_path
+
+
+def _gunzip(data):
+    return gzip.GzipFile(fileobj=io.BytesIO(data)).read()
+
+
+def test_iter_html():
+    dp = tempfile.mkdtemp()
+    try:
+        for filename in ('has_image.docx', 'nested_tables.docx'):
+            file_path = _fixture(dp, filename)
+            assert ''.join(iter_html(file_path)) == convert(file_path)
+    finally:
+        shutil.rmtree(dp)
+
+
+def test_write_compressed_gzip():
+    dp = tempfile.mkdtemp()
+    try:
+        file_path = _fixture(dp, 'nested_tables.docx')
+        html = convert(file_path)
+        outputs = []
+        for _ in range(2):
+            f = io.BytesIO()
+            result = write_compressed(file_path, f, etag=True)
+            outputs.append((f.getvalue(), result))
+    finally:
+        shutil.rmtree(dp)
+
+    data, result = outputs[0]
+    assert _gunzip(data) == html
+    assert result.encoding == 'gzip'
+    assert result.html_bytes == len(html)
+    assert result.compressed_bytes == len(data)
+    assert result.etag == '"%s"' % hashlib.sha1(data).hexdigest()
+    # No timestamp in the stream, the same document gives the same ETag.
+    assert outputs[1] == outputs[0]
+
+
+def test_write_compressed_brotli():
+    if compression.brotli is None:
+        raise SkipTest('brotli is not available')
+    dp = tempfile.mkdtemp()
+    try:
+        file_path = _fixture(dp, 'nested_tables.docx')
+        html = convert(file_path)
+        f = io.BytesIO()
+        result = write_compressed(file_path, f, encoding='br')
+    finally:
+        shutil.rmtree(dp)
+    assert compression.brotli.decompress(f.getvalue()) == html
+    assert result.encoding == 'br'
+    assert result.etag is None
+
+
+def test_unsupported_encoding():
+    with assert_raises(ValueError):
+        CompressedWriter(io.BytesIO(), encoding='deflate')
@@ -0,0 +1,131 @@
+import shutil
+import tempfile
+import time
+from os import path
+from unittest import TestCase
+
+from docx2html.converters import ConverterPool, StubBackend
+from docx2html.core import convert, replace_ext
+from docx2html.exceptions import ConversionFailed
+
+
+class ConverterPoolTestCase(TestCase):
+    def setUp(self):
+        self.dp = tempfile.mkdtemp()
+        self.docx = path.join(
+            path.abspath(path.dirname(__file__)),
+            '..',
+            'fixtures',
+            'simple.docx',
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.dp)
+
+    def _doc(self, name, content=None):
+        # The stub backend "converts" by copying, so a .doc is a docx.
+        file_path = path.join(self.dp, name)
+        if content is None:
+            shutil.copyfile(self.docx, file_path)
+        else:
+            with open(file_path, 'wb') as f:
+                f.write(content)
+        return replace_ext(file_path, '.docx'), file_path
+
+    def test_convert(self):
+        docx_path, file_path = self._doc('simple.doc')
+        with ConverterPool(StubBackend()) as pool:
+            html = convert(file_path, converter=pool.convert)
+        assert html == convert(self.docx)
+        assert path.isfile(docx_path)
+
+    def test_batches(self):
+        paths = [self._doc('%d.doc' % i) for i in range(5)]
+        with ConverterPool(StubBackend(), workers=1) as pool:
+            assert pool.convert_many(paths) == [True] * 5
+        # Queued files are converted together.
+        assert pool.commands == 1
+
+    def test_failing_file_in_batch(self):
+        paths = [
+            self._doc('a.doc'),
+            self._doc('b.doc', b'fail'),
+            self._doc('c.doc'),
+        ]
+        with ConverterPool(StubBackend(), workers=1) as pool:
+            assert pool.convert_many(paths) == [True, False, True]
+        # The batch stopped at the bad file, the files it did not convert
+        # were tried on their own.
+        assert pool.commands == 3
+
+    def test_timeout(self):
+        hung = self._doc('hung.doc', b'hang')
+        good = self._doc('good.doc')
+        with ConverterPool(StubBackend(), workers=1, timeout=0.5) as pool:
+            assert not pool.convert(*hung)
+            # The worker goes on with a new converter.
+            assert pool.convert(*good)
+        assert pool.timeouts == 1
+
+    def test_timeout_per_file(self):
+        # Each file may take almost the timeout.
+        paths = [self._doc('%d.doc' % i, b'slow0.3') for i in range(4)]
+        with ConverterPool(StubBackend(), workers=1, timeout=0.5) as pool:
+            assert pool.convert_many(paths) == [True] * 4
+        assert pool.commands == 1
+        assert pool.timeouts == 0
+
+        # A hung file does not get the time of the whole batch.
+        paths = [self._doc('hung.doc', b'hang')]
+        paths.extend(self._doc('%d.doc' % i) for i in range(5))
+        start = time.time()
+        with ConverterPool(StubBackend(), workers=1, timeout=0.5) as pool:
+            assert pool.convert_many(paths) == [False] + [True] * 5
+        assert time.time() - start < 0.5 * len(paths)
+        assert pool.timeouts == 2
+
+    def test_timeout_removes_output(self):
+        # The converter was killed while it was writing the docx.
+        docx_path, file_path = self._doc('part.doc', b'part')
+        with ConverterPool(StubBackend(), workers=1, timeout=0.5) as pool:
+            self.assertRaises(
+                ConversionFailed,
+                convert,
+                file_path,
+                converter=pool.convert,
+            )
+            assert not path.exists(docx_path)
+            html = convert(
+                file_path,
+                converter=pool.convert,
+                fall_back=lambda file_path: 'fall back',
+            )
+        assert html == 'fall back'
+        assert pool.timeouts == 2
+
+    def test_missing_converter(self):
+        class MissingBackend(StubBackend):
+            def get_command(self, jobs):
+                return ['docx2html-no-such-converter']
+
+        docx_path, file_path = self._doc('simple.doc')
+        with ConverterPool(MissingBackend()) as pool:
+            assert not pool.convert(docx_path, file_path)
+
+    def test_backend_error(self):
+        class BrokenBackend(StubBackend):
+            def get_command(self, jobs):
+                for job in jobs:
+                    if 'broken' in job.file_path:
+                        raise ValueError('broken backend')
+                return StubBackend.get_command(self, jobs)
+
+        broken = self._doc('broken.doc')
+        good = self._doc('good.doc')
+        with ConverterPool(BrokenBackend(), workers=1) as pool:
+            self.assertRaises(ValueError, pool.convert, *broken)
+            # The worker is still there.
+            assert pool.convert(*good)
+            # The good files of a batch with a broken one are converted.
+            paths = [self._doc('a.doc'), self._doc('broken2.doc')]
+            assert pool.convert_many(paths) == [True, False]
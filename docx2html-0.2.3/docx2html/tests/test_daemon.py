@@ -0,0 +1,146 @@
+import base64
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import tempfile
+import time
+from os import path
+from StringIO import StringIO
+
+from docx2html.daemon import handle_request, serve_socket, serve_stdio
+
+
+def _fixture(filename):
+    return path.join(
+        path.abspath(path.dirname(__file__)),
+        '..',
+        'fixtures',
+        filename,
+    )
+
+
+def _read_fixture(filename):
+    with open(_fixture(filename), 'rb') as f:
+        return base64.b64encode(f.read())
+
+
+def test_handle_request_path():
+    dp = tempfile.mkdtemp()
+    try:
+        file_path = path.join(dp, 'has_image.docx')
+        shutil.copyfile(_fixture('has_image.docx'), file_path)
+        response = handle_request({'id': 1, 'path': file_path})
+    finally:
+        shutil.rmtree(dp)
+
+    assert response['id'] == 1
+    assert 'error' not in response, response
+    assert '<img src="%s/word/media/image1.gif"' % dp in response['html']
+    assert response['media'] == [{
+        'image_id': 'rId2',
+        'path': '%s/word/media/image1.gif' % dp,
+    }]
+
+
+def test_handle_request_path_escaped():
+    # The path of the media is not escaped like the src in the html.
+    dp = path.join(tempfile.mkdtemp(), 'R&D')
+    try:
+        os.mkdir(dp)
+        file_path = path.join(dp, 'has_image.docx')
+        shutil.copyfile(_fixture('has_image.docx'), file_path)
+        response = handle_request({
+            'id': 1,
+            'path': file_path,
+            'inline_media': True,
+        })
+    finally:
+        shutil.rmtree(path.dirname(dp))
+
+    assert 'error' not in response, response
+    media = response['media'][0]
+    assert media['path'] == '%s/word/media/image1.gif' % dp
+    assert base64.b64decode(media['data']).startswith('GIF')
+
+
+def test_handle_request_data():
+    response = handle_request({
+        'id': 2,
+        'data': _read_fixture('has_image.docx'),
+        'filename': 'has_image.docx',
+    })
+    assert 'error' not in response, response
+    assert len(response['media']) == 1
+    # The image is sent back since the temporary directory is gone.
+    media = response['media'][0]
+    assert not path.exists(media['path'])
+    assert base64.b64decode(media['data']).startswith('GIF')
+
+
+def test_handle_request_error():
+    response = handle_request({'id': 3, 'path': 'test.doc'})
+    assert response == {
+        'id': 3,
+        'error': 'FileNotDocx: The file passed in is not a docx.',
+    }
+    response = handle_request({'id': 4})
+    assert response['error'].startswith('ValueError')
+
+
+def _requests(count):
+    lines = []
+    for i in range(count):
+        lines.append(json.dumps({
+            'id': i,
+            'data': _read_fixture('simple.docx'),
+        }))
+    lines.append('not json')
+    return '\n'.join(lines) + '\n'
+
+
+def test_serve_stdio():
+    for workers in (1, 2):
+        stdout = StringIO()
+        serve_stdio(StringIO(_requests(3)), stdout, workers=workers)
+        responses = [json.loads(line) for line in stdout.getvalue().split(
+            '\n') if line]
+        assert len(responses) == 4
+        ids = sorted(response['id'] for response in responses)
+        assert ids == [None, 0, 1, 2]
+        for response in responses:
+            if response['id'] is None:
+                assert response['error'].startswith('ValueError')
+            else:
+                assert 'Simple text' in response['html']
+
+
+def test_serve_socket():
+    dp = tempfile.mkdtemp()
+    socket_path = path.join(dp, 'docx2html.sock')
+    server = multiprocessing.Process(
+        target=serve_socket,
+        args=(socket_path, 2),
+    )
+    server.start()
+    try:
+        for _ in range(50):
+            if path.exists(socket_path):
+                break
+            time.sleep(0.1)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path)
+        f = client.makefile('rwb')
+        f.write(_requests(2))
+        f.flush()
+        responses = [json.loads(f.readline()) for _ in range(3)]
+        f.close()
+        client.close()
+    finally:
+        server.terminate()
+        server.join()
+        shutil.rmtree(dp)
+    assert [response['id'] for response in responses] == [0, 1, None]
+    assert 'Simple text' in responses[0]['html']
+    assert not os.path.exists(socket_path)
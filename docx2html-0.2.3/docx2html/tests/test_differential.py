@@ -0,0 +1,89 @@
+import shutil
+import tempfile
+from os import path
+
+from docx2html import convert
+from docx2html.differential import (
+    ENGINES,
+    check_corpus,
+    compare_html,
+    normalize_blocks,
+    register_engine,
+)
+
+
+def _fixture(filename):
+    return path.join(
+        path.abspath(path.dirname(__file__)),
+        '..',
+        'fixtures',
+        filename,
+    )
+
+
+def test_normalize_blocks():
+    html = '''
+    <html>
+        <p>AAA</p>
+        <td rowspan="2" colspan="3">BBB</td>
+    </html>
+    '''
+    assert normalize_blocks(html) == [
+        '<p>AAA</p>',
+        '<td colspan="3" rowspan="2">BBB</td>',
+    ]
+
+
+def test_compare_html_equivalent():
+    expected = '<html><p>AAA</p><ol><li>BBB</li></ol></html>'
+    actual = '''
+    <html>
+        <p>AAA</p>
+        <ol>
+            <li>BBB</li>
+        </ol>
+    </html>
+    '''
+    assert compare_html(expected, actual) is None
+
+
+def test_compare_html_first_divergent_block():
+    expected = '<html><p>AAA</p><p>BBB</p><p>CCC</p></html>'
+    actual = '<html><p>AAA</p><p><strong>BBB</strong></p><p>DDD</p></html>'
+    divergence = compare_html(expected, actual)
+    assert divergence.index == 1
+    assert divergence.expected == '<p>BBB</p>'
+    assert divergence.actual == '<p><strong>BBB</strong></p>'
+
+
+def test_compare_html_missing_block():
+    expected = '<html><p>AAA</p><p>BBB</p></html>'
+    actual = '<html><p>AAA</p></html>'
+    divergence = compare_html(expected, actual)
+    assert divergence.index == 1
+    assert divergence.actual is None
+
+
+def test_check_corpus():
+    dp = tempfile.mkdtemp()
+    for filename in ('simple.docx', 'nested_tables.docx'):
+        shutil.copyfile(_fixture(filename), path.join(dp, filename))
+
+    def extra_block(file_path):
+        html = convert(file_path)
+        return html.replace('</html>', '<p>extra</p></html>')
+
+    register_engine('extra_block', extra_block)
+    try:
+        results = list(check_corpus([dp], 'legacy'))
+        assert [r.divergence for r in results] == [None, None]
+
+        results = list(check_corpus([dp], 'extra_block'))
+        assert len(results) == 2
+        for result in results:
+            assert result.error is None
+            assert result.divergence.expected is None
+            assert result.divergence.actual == '<p>extra</p>'
+    finally:
+        del ENGINES['extra_block']
+        shutil.rmtree(dp)
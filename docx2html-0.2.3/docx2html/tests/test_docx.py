@@ -1,13 +1,19 @@
 import mock
+import os
+import re
 import tempfile
 import shutil
+from copy import deepcopy
 from os import path
 from zipfile import ZipFile
+from lxml import etree
 from nose.plugins.skip import SkipTest
 from nose.tools import assert_raises
 
-from docx2html.tests import collapse_html
-from docx2html import convert
+from docx2html.utils import collapse_html
+from docx2html.tests.benchmark import _image_data
+from docx2html.tests.document_builder import DocxBuilder as DXB
+from docx2html import convert, core
 from docx2html.core import (
     _get_document_data,
     DETECT_FONT_SIZE,
@@ -448,6 +454,353 @@ def test_has_image_using_image_handler():
     ''')
 
 
+def test_has_image_using_bulk_image_handler():
+    filename = 'has_image.docx'
+    file_path = path.join(
+        path.abspath(path.dirname(__file__)),
+        '..',
+        'fixtures',
+        'has_image.docx',
+    )
+    new_file_path, dp = _copy_file_to_tmp_dir(file_path, filename)
+
+    calls = []
+
+    def bulk_image_handler(images):
+        calls.append(images)
+        return dict((image.image_id, 'bulk') for image in images)
+    actual_html = convert(
+        new_file_path,
+        bulk_image_handler=bulk_image_handler,
+    )
+    assert_html_equal(actual_html, '''
+    <html><p>AAA<img src="bulk" height="55" width="260" /></p></html>
+    ''')
+    assert len(calls) == 1
+    assert [tuple(image) for image in calls[0]] == [
+        ('rId2', '%s/word/media/image1.gif' % dp, (260, 55)),
+    ]
+
+
+def _write_docx_with_duplicate_images(file_path):
+    # image1.png is a copy of image0.png, as when a picture is pasted twice.
+    images = [
+        ('rId10', 'media/image0.png', _image_data(0)),
+        ('rId11', 'media/image1.png', _image_data(0)),
+        ('rId12', 'media/image2.png', _image_data(1)),
+    ]
+    body = ''.join(
+        DXB.drawing(r_id, width=16, height=16) for r_id, _, _ in images
+    )
+    zf = ZipFile(file_path, 'w')
+    try:
+        zf.writestr('word/document.xml', DXB.xml(body).encode('utf-8'))
+        zf.writestr(
+            'word/_rels/document.xml.rels',
+            DXB.relationships_xml([
+                (r_id, 'image', target) for r_id, target, _ in images
+            ]).encode('utf-8'),
+        )
+        for _, target, data in images:
+            zf.writestr('word/' + target, data)
+    finally:
+        zf.close()
+
+
+def _counting_image_handler(calls):
+    def image_handler(image_id, relationship_dict):
+        calls.append(image_id)
+        return 'src-%s' % image_id
+    return image_handler
+
+
+def test_duplicate_images():
+    dp = tempfile.mkdtemp()
+    try:
+        file_path = path.join(dp, 'duplicates.docx')
+        _write_docx_with_duplicate_images(file_path)
+        calls = []
+        actual_html = convert(
+            file_path,
+            image_handler=_counting_image_handler(calls),
+        )
+        extracted = sorted(os.listdir(path.join(dp, 'word', 'media')))
+    finally:
+        shutil.rmtree(dp)
+
+    # The copy is neither extracted nor handled, it shares the src.
+    assert calls == ['rId10', 'rId12']
+    assert extracted == ['image0.png', 'image2.png']
+    assert re.findall(r'src="([^"]*)"', actual_html) == [
+        'src-rId10',
+        'src-rId10',
+        'src-rId12',
+    ]
+
+
+def test_image_cache_across_documents():
+    dp = tempfile.mkdtemp()
+    try:
+        image_cache = {}
+        calls = []
+        for name in ('first', 'second'):
+            file_path = path.join(dp, name, 'duplicates.docx')
+            os.mkdir(path.dirname(file_path))
+            _write_docx_with_duplicate_images(file_path)
+            actual_html = convert(
+                file_path,
+                image_handler=_counting_image_handler(calls),
+                image_cache=image_cache,
+            )
+    finally:
+        shutil.rmtree(dp)
+
+    # The second document reuses the srcs of the first.
+    assert calls == ['rId10', 'rId12']
+    assert len(image_cache) == 2
+    assert 'src-rId12' in actual_html
+
+
+def _write_docx(file_path, body):
+    zf = ZipFile(file_path, 'w')
+    try:
+        zf.writestr('word/document.xml', DXB.xml(body).encode('utf-8'))
+        zf.writestr(
+            'word/numbering.xml',
+            DXB.numbering_xml({'1': {0: 'decimal'}}).encode('utf-8'),
+        )
+    finally:
+        zf.close()
+
+
+def test_fragment_cache():
+    filenames = (
+        'has_image.docx',
+        'simple_lists.docx',
+        'tables_in_lists.docx',
+        'table_col_row_span.docx',
+    )
+    dp = tempfile.mkdtemp()
+    try:
+        for filename in filenames:
+            file_path = path.join(dp, filename)
+            shutil.copyfile(
+                path.join(
+                    path.abspath(path.dirname(__file__)),
+                    '..',
+                    'fixtures',
+                    filename,
+                ),
+                file_path,
+            )
+            expected_html = convert(file_path)
+            fragment_cache = {}
+            # Once to fill the cache and once from the cache.
+            for _ in range(2):
+                actual_html = convert(file_path, fragment_cache=fragment_cache)
+                assert actual_html == expected_html, filename
+
+        # The paragraph is in the list because of the list item after it.
+        file_path = path.join(dp, 'list_end.docx')
+        _write_docx(
+            file_path,
+            DXB.li(text='L1', ilvl=1, numId=1) +
+            DXB.li(text='L0', ilvl=1, numId=1) +
+            DXB.p_tag('P1') +
+            DXB.li(text='L3', ilvl=0, numId=1),
+        )
+        expected_html = convert(file_path)
+        actual_html = convert(file_path, fragment_cache={})
+    finally:
+        shutil.rmtree(dp)
+    assert '<li>L0<br />P1</li></ol>' in expected_html
+    assert actual_html == expected_html
+
+
+def test_fragment_cache_only_renders_changed_blocks():
+    dp = tempfile.mkdtemp()
+    try:
+        fragment_cache = {}
+        lis = ''.join(
+            DXB.li(text='Item %d' % i, ilvl=0, numId=1) for i in range(3)
+        )
+        for name, text in (('v1.docx', 'BBB'), ('v2.docx', 'CCC')):
+            file_path = path.join(dp, name)
+            _write_docx(
+                file_path,
+                DXB.p_tag('AAA') + lis + DXB.p_tag(text),
+            )
+            render_block = mock.patch(
+                'docx2html.core._render_block',
+                side_effect=core._render_block,
+            )
+            with render_block as patched:
+                actual_html = convert(file_path, fragment_cache=fragment_cache)
+            assert actual_html == convert(file_path)
+    finally:
+        shutil.rmtree(dp)
+
+    # The paragraphs before and the list are taken from the cache.
+    assert patched.call_count == 1
+    assert len(fragment_cache) == 4
+
+
+def test_fragment_cache_image_placeholder_in_text():
+    # Text that looks like the placeholder of an image is left alone.
+    dp = tempfile.mkdtemp()
+    try:
+        file_path = path.join(dp, 'placeholder.docx')
+        _write_docx(
+            file_path,
+            DXB.p_tag('docx2html-fragment-image-72496431') +
+            DXB.p_tag(
+                '&lt;img src="docx2html-fragment-image-72496431"&gt;',
+            ),
+        )
+        expected_html = convert(file_path)
+        actual_html = convert(file_path, fragment_cache={})
+    finally:
+        shutil.rmtree(dp)
+    assert actual_html == expected_html
+    assert 'docx2html-fragment-image-72496431' in actual_html
+
+
+def test_fragment_cache_image_src():
+    # The src is escaped the same way as by convert.
+    dp = tempfile.mkdtemp()
+    try:
+        # The images are extracted next to the docx, so work on a copy.
+        file_path = path.join(dp, 'has_image.docx')
+        shutil.copyfile(
+            path.join(
+                path.abspath(path.dirname(__file__)),
+                '..',
+                'fixtures',
+                'has_image.docx',
+            ),
+            file_path,
+        )
+        for src, expected_src in (
+                (u'/caf\xe9.gif', '/caf%C3%A9.gif'),
+                ('/image.gif?size=1', '/image.gif?size=1')):
+            def image_handler(image_id, relationship_dict):
+                return src
+            expected_html = convert(file_path, image_handler=image_handler)
+            actual_html = convert(
+                file_path,
+                image_handler=image_handler,
+                fragment_cache={},
+            )
+            assert actual_html == expected_html, src
+            assert type(actual_html) is type(expected_html)
+            assert '<img src="%s"' % expected_src in actual_html
+    finally:
+        shutil.rmtree(dp)
+
+
+def test_parts_cache():
+    filename = 'simple_lists.docx'
+    file_path = path.join(
+        path.abspath(path.dirname(__file__)),
+        '..',
+        'fixtures',
+        filename,
+    )
+    core.PARTS_CACHE.clear()
+    expected_html = convert(file_path)
+    # The second time the styles and numbering come from the cache.
+    with mock.patch('docx2html.core._get_styles_part_dict') as styles:
+        with mock.patch('docx2html.core._get_numbering_part_dict') as numbers:
+            actual_html = convert(file_path)
+    assert actual_html == expected_html
+    assert not styles.called
+    assert not numbers.called
+    assert core.PARTS_CACHE.hits == 2
+
+
+def test_parts_cache_hands_out_copies():
+    # What one conversion does with its dicts does not reach the next.
+    file_path = path.join(
+        path.abspath(path.dirname(__file__)),
+        '..',
+        'fixtures',
+        'simple_lists.docx',
+    )
+    core.PARTS_CACHE.clear()
+    zf = ZipFile(file_path)
+    try:
+        item = zf.getinfo('word/numbering.xml')
+        numbering_dict = core._read_numbering_part(zf, item)
+        expected = deepcopy(numbering_dict)
+        assert expected
+        numbering_dict['missing'] = {}
+        for levels in numbering_dict.values():
+            levels[0] = 'changed'
+        assert core._read_numbering_part(zf, item) == expected
+        assert core.PARTS_CACHE.hits == 1
+    finally:
+        zf.close()
+
+
+def test_streamed_parts():
+    # The streamed parts give the same dicts as the parsed trees.
+    fixtures = path.join(
+        path.abspath(path.dirname(__file__)),
+        '..',
+        'fixtures',
+    )
+    for filename in sorted(os.listdir(fixtures)):
+        if not filename.endswith('.docx'):
+            continue
+        zf = ZipFile(path.join(fixtures, filename))
+        for item in zf.infolist():
+            if item.filename == 'word/styles.xml':
+                tree = etree.fromstring(zf.read(item.filename))
+                assert core._get_styles_part_dict(zf, item) == (
+                    core.get_style_dict(tree)
+                ), filename
+            elif item.filename == 'word/numbering.xml':
+                tree = etree.fromstring(zf.read(item.filename))
+                assert core._get_numbering_part_dict(zf, item) == (
+                    core.get_numbering_info(tree)
+                ), filename
+            elif item.filename == 'word/_rels/document.xml.rels':
+                tree = etree.fromstring(zf.read(item.filename))
+                assert core._read_relationships_part(zf, item) == [
+                    (el.get('Id'), el.get('Target'))
+                    for el in tree.iter()
+                    if el.get('Id') is not None
+                ], filename
+        zf.close()
+
+
+def test_read_parts_concurrently():
+    filenames = ('has_image.docx', 'simple_lists.docx', 'nested_tables.docx')
+    dp = tempfile.mkdtemp()
+    try:
+        for filename in filenames:
+            file_path = path.join(dp, filename)
+            shutil.copyfile(
+                path.join(
+                    path.abspath(path.dirname(__file__)),
+                    '..',
+                    'fixtures',
+                    filename,
+                ),
+                file_path,
+            )
+            with mock.patch('docx2html.core.PARSE_THREADS', 0):
+                expected_html = convert(file_path)
+            with mock.patch('docx2html.core.PARSE_THREADS', 4):
+                assert convert(file_path) == expected_html, filename
+                # A zip file opened from a file object is read in order.
+                with open(file_path, 'rb') as f:
+                    _, meta_data = _get_document_data(ZipFile(f))
+                assert meta_data.numbering_dict or meta_data.styles_dict
+    finally:
+        shutil.rmtree(dp)
+
+
 def test_attachment_is_tiff():
     filename = 'attachment_is_tiff.docx'
     file_path = path.join(
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import time
+from os import path
+
+# Seconds ``import docx2html`` may take on top of a bare interpreter, this is
+# generous on purpose, it is here to catch a heavy import creeping back in.
+IMPORT_BUDGET = 1.0
+REPEAT = 3
+
+PACKAGE_ROOT = path.abspath(path.join(path.dirname(__file__), '..', '..'))
+
+
+def _env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [PACKAGE_ROOT] + [p for p in [env.get('PYTHONPATH')] if p])
+    return env
+
+
+def _run(code):
+    return subprocess.check_output(
+        [sys.executable, '-c', code],
+        env=_env(),
+    ).strip()
+
+
+def _best_time(code):
+    best = None
+    for _ in range(REPEAT):
+        start = time.time()
+        _run(code)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def test_import_does_not_load_pil():
+    # PIL is only needed once a document has images.
+    output = _run('import sys, docx2html; print("PIL" in sys.modules)')
+    assert output == b'False', output
+
+
+def test_import_budget():
+    baseline = _best_time('pass')
+    elapsed = _best_time('import docx2html')
+    assert elapsed - baseline < IMPORT_BUDGET, elapsed - baseline
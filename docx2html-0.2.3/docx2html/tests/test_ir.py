@@ -0,0 +1,87 @@
+import json
+import shutil
+import tempfile
+from os import path
+from StringIO import StringIO
+
+from nose.tools import assert_raises
+
+from docx2html.core import convert
+from docx2html.ir import build_ir, dump_ir, load_ir, render_html
+
+FIXTURES = (
+    'has_image.docx',
+    'nested_tables.docx',
+    'simple_lists.docx',
+    'table_col_row_span.docx',
+)
+
+
+def _copy_fixtures(*filenames):
+    # The images are extracted next to the docx, so work on a copy.
+    dp = tempfile.mkdtemp()
+    for filename in filenames:
+        shutil.copyfile(
+            path.join(
+                path.abspath(path.dirname(__file__)),
+                '..',
+                'fixtures',
+                filename,
+            ),
+            path.join(dp, filename),
+        )
+    return dp
+
+
+def _round_trip(ir):
+    f = StringIO()
+    dump_ir(ir, f)
+    f.seek(0)
+    return load_ir(f)
+
+
+def test_render_html_matches_convert():
+    dp = _copy_fixtures(*FIXTURES)
+    try:
+        for filename in FIXTURES:
+            file_path = path.join(dp, filename)
+            expected = convert(file_path)
+            ir = build_ir(file_path)
+            assert render_html(ir) == expected, filename
+            assert render_html(_round_trip(ir)) == expected, filename
+    finally:
+        shutil.rmtree(dp)
+
+
+def test_render_html_image_handler():
+    dp = _copy_fixtures('has_image.docx')
+    try:
+        ir = _round_trip(build_ir(path.join(dp, 'has_image.docx')))
+    finally:
+        shutil.rmtree(dp)
+
+    calls = []
+
+    def image_handler(image_id, relationship_dict):
+        calls.append(image_id)
+        return 'http://example.com/%s?a=1&amp;b=2' % image_id
+    html = render_html(ir, image_handler=image_handler)
+    assert calls == ['rId2']
+    assert 'src="http://example.com/rId2?a=1&amp;b=2"' in html, html
+
+
+def test_render_html_max_blocks():
+    dp = _copy_fixtures('simple_lists.docx')
+    try:
+        ir = build_ir(path.join(dp, 'simple_lists.docx'))
+    finally:
+        shutil.rmtree(dp)
+    assert len(ir.blocks) > 1
+    html = render_html(ir, max_blocks=1)
+    assert html == render_html(ir._replace(blocks=ir.blocks[:1]))
+    assert len(html) < len(render_html(ir))
+
+
+def test_load_ir_version():
+    f = StringIO(json.dumps({'version': 0}))
+    assert_raises(ValueError, load_ir, f)
@@ -0,0 +1,186 @@
+import multiprocessing
+import shutil
+import tempfile
+import time
+from os import path
+from unittest import TestCase
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import mock
+from nose.plugins.skip import SkipTest
+
+from docx2html.batch import convert_scheduled
+from docx2html import core
+from docx2html.core import convert
+from docx2html.daemon import handle_request
+from docx2html.exceptions import LimitExceeded
+from docx2html.limits import (
+    Limits,
+    check_elements,
+    check_size,
+    convert_limited,
+    set_memory_limit,
+    time_limit,
+)
+
+FIXTURES = path.join(path.abspath(path.dirname(__file__)), '..', 'fixtures')
+
+
+def _allocate(size):
+    # Runs on a worker process with a memory limit.
+    try:
+        return len(bytearray(size))
+    except MemoryError:
+        return None
+
+
+def _address_space():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmSize:'):
+                return int(line.split()[1]) * 1024
+
+
+class LimitsTestCase(TestCase):
+    def setUp(self):
+        self.dp = tempfile.mkdtemp()
+        self.simple = path.join(FIXTURES, 'simple.docx')
+
+    def tearDown(self):
+        shutil.rmtree(self.dp)
+
+    def _bomb(self, size=10 * 1024 * 1024):
+        # A docx with a part that compresses to almost nothing.
+        file_path = path.join(self.dp, 'bomb.docx')
+        shutil.copyfile(self.simple, file_path)
+        zf = ZipFile(file_path, 'a', ZIP_DEFLATED)
+        zf.writestr('word/media/zeros.bin', b'\0' * size)
+        zf.close()
+        assert path.getsize(file_path) < size // 100
+        return file_path
+
+    def test_check_size(self):
+        bomb = self._bomb()
+        self.assertRaises(LimitExceeded, check_size, bomb, 1024 * 1024)
+        check_size(bomb, 20 * 1024 * 1024)
+        # Missing, left to the conversion.
+        check_size(path.join(self.dp, 'missing.docx'), 1)
+        # Not a docx, checked by its size.
+        file_path = path.join(self.dp, 'big.doc')
+        with open(file_path, 'wb') as f:
+            f.write(b'\0' * 1024)
+        self.assertRaises(LimitExceeded, check_size, file_path, 1023)
+        check_size(file_path, 1024)
+
+    def test_check_elements(self):
+        self.assertRaises(LimitExceeded, check_elements, self.simple, 10)
+        check_elements(self.simple, 100000)
+
+    def test_time_limit(self):
+        start = time.time()
+        with self.assertRaises(LimitExceeded):
+            with time_limit(0.1):
+                time.sleep(5)
+        assert time.time() - start < 1
+        # The alarm is off after the block.
+        with time_limit(0.1):
+            pass
+        time.sleep(0.2)
+
+    def test_convert_limited(self):
+        assert convert_limited(self.simple, Limits()) == convert(self.simple)
+        self.assertRaises(
+            LimitExceeded,
+            convert_limited,
+            self._bomb(),
+            Limits(max_bytes=1024 * 1024),
+        )
+
+        # The converter runs within the timeout.
+        def converter(docx_path, file_path):
+            time.sleep(5)
+
+        file_path = path.join(self.dp, 'slow.doc')
+        shutil.copyfile(self.simple, file_path)
+        self.assertRaises(
+            LimitExceeded,
+            convert_limited,
+            file_path,
+            Limits(timeout=0.1),
+            converter=converter,
+        )
+
+    def test_convert_limited_converter(self):
+        # A file that is not a docx is checked before and after it is
+        # converted.
+        bomb = self._bomb()
+
+        def converter(docx_path, file_path):
+            shutil.copyfile(bomb, docx_path)
+
+        file_path = path.join(self.dp, 'small.doc')
+        with open(file_path, 'wb') as f:
+            f.write(b'\0' * 1024)
+        for limits in (
+                Limits(max_bytes=1023),
+                Limits(max_bytes=1024 * 1024),
+                Limits(max_elements=10)):
+            self.assertRaises(
+                LimitExceeded,
+                convert_limited,
+                file_path,
+                limits,
+                converter=converter,
+            )
+
+    def test_convert_limited_single_threaded(self):
+        # Parts read on other threads would not be stopped by the timeout.
+        thread_counts = []
+
+        def read_parts(f):
+            thread_counts.append(core.PARSE_THREADS)
+            return read_parts.original(f)
+        read_parts.original = core._read_parts
+
+        with mock.patch('docx2html.core._read_parts', read_parts):
+            convert_limited(self.simple, Limits(timeout=60))
+            convert_limited(self.simple, Limits())
+        assert thread_counts == [0, core.PARSE_THREADS]
+        assert core.PARSE_THREADS
+
+    def test_convert_scheduled(self):
+        bomb = self._bomb()
+        file_paths = [bomb, self.simple]
+        results = list(convert_scheduled(
+            file_paths,
+            workers=1,
+            big_workers=1,
+            limits=Limits(max_bytes=1024 * 1024),
+        ))
+        results = dict((r.file_path, r) for r in results)
+        assert isinstance(results[bomb].error, LimitExceeded)
+        # The worker went on with the next file.
+        assert results[self.simple].html == convert(self.simple)
+
+    def test_daemon(self):
+        limits = Limits(max_elements=10)
+        response = handle_request({'id': 1, 'path': self.simple}, limits)
+        assert response['error'].startswith('LimitExceeded: ')
+        response = handle_request({'id': 2, 'path': self.simple})
+        assert 'html' in response
+
+    def test_memory_limit(self):
+        if not path.exists('/proc/self/status'):
+            raise SkipTest('Needs /proc')
+        max_memory = _address_space() + 200 * 1024 * 1024
+        pool = multiprocessing.Pool(
+            processes=1,
+            initializer=set_memory_limit,
+            initargs=(max_memory,),
+        )
+        try:
+            assert pool.apply(_allocate, (1024 * 1024 * 1024,)) is None
+            # The worker is still there.
+            assert pool.apply(_allocate, (1024,)) == 1024
+        finally:
+            pool.terminate()
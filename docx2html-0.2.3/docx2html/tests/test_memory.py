@@ -0,0 +1,90 @@
+import mock
+import shutil
+import tempfile
+from os import path
+
+from docx2html import memory
+from docx2html.memory import profile_conversion, profile_corpus
+
+
+def _copy_fixtures(*filenames):
+    # The images are extracted next to the docx, so work on a copy.
+    dp = tempfile.mkdtemp()
+    for filename in filenames:
+        shutil.copyfile(
+            path.join(
+                path.abspath(path.dirname(__file__)),
+                '..',
+                'fixtures',
+                filename,
+            ),
+            path.join(dp, filename),
+        )
+    return dp
+
+
+def test_profile_conversion():
+    dp = _copy_fixtures('has_image.docx')
+    try:
+        result = profile_conversion(path.join(dp, 'has_image.docx'), top=3)
+    finally:
+        shutil.rmtree(dp)
+
+    assert result['html_bytes'] > 0
+    assert [phase['name'] for phase in result['phases']] == [
+        'open',
+        'parse',
+        'render',
+    ]
+    for phase in result['phases']:
+        assert phase['peak_rss_kb'] > 0
+        assert phase['peak_rss_growth_kb'] >= 0
+        if memory.tracemalloc is not None:
+            assert len(phase['top_allocations']) <= 3
+            assert phase['traced_peak_bytes'] >= phase['traced_bytes']
+
+
+def test_profile_conversion_without_tracemalloc():
+    # What python 2 gets, on any python.
+    dp = _copy_fixtures('simple.docx')
+    try:
+        with mock.patch.object(memory, 'tracemalloc', None):
+            result = profile_conversion(path.join(dp, 'simple.docx'))
+    finally:
+        shutil.rmtree(dp)
+
+    assert result['tracemalloc'] is False
+    assert len(result['phases']) == 3
+    for phase in result['phases']:
+        assert phase['peak_rss_kb'] > 0
+        assert phase['peak_rss_growth_kb'] >= 0
+        assert 'top_allocations' not in phase
+    assert memory.format_result(result).startswith(result['file_path'])
+
+
+def test_profile_corpus():
+    dp = _copy_fixtures('simple.docx', 'nested_tables.docx')
+    try:
+        results = list(profile_corpus([dp], isolate=False))
+        isolated_results = list(profile_corpus([dp]))
+    finally:
+        shutil.rmtree(dp)
+
+    assert len(results) == 2
+    assert len(isolated_results) == 2
+    for result in results + isolated_results:
+        assert 'error' not in result
+        assert len(result['phases']) == 3
+
+
+def test_profile_corpus_error():
+    dp = tempfile.mkdtemp()
+    try:
+        file_path = path.join(dp, 'broken.docx')
+        with open(file_path, 'w') as f:
+            f.write('not a zip')
+        results = list(profile_corpus([dp], isolate=False))
+    finally:
+        shutil.rmtree(dp)
+    assert len(results) == 1
+    assert 'error' in results[0]
@@ -0,0 +1,89 @@
+import threading
+import time
+from os import path
+
+from lxml import etree
+
+from docx2html import convert, core
+from docx2html.core import is_bold
+from docx2html.profiling import CallProfiler, profile
+
+
+def _fixture(filename):
+    return path.join(
+        path.abspath(path.dirname(__file__)),
+        '..',
+        'fixtures',
+        filename,
+    )
+
+
+def _p_tag():
+    return etree.fromstring(
+        '<w:p xmlns:w="http://schemas.openxmlformats.org/'
+        'wordprocessingml/2006/main"><w:r><w:t>AAA</w:t></w:r></w:p>'
+    )
+
+
+def test_profiling_is_off_by_default():
+    assert core.PROFILER is None
+
+
+def test_profile_records_calls():
+    with profile() as profiler:
+        html = convert(_fixture('simple.docx'))
+    assert core.PROFILER is None
+
+    # Profiling does not change the output.
+    assert html == convert(_fixture('simple.docx'))
+
+    for name in ('is_header', 'is_li', 'get_v_merge', 'build_table'):
+        assert profiler.stats[name].calls > 0, name
+    # build_table is only called with tbl tags.
+    assert profiler.stats['build_table'].short_circuits == 0
+
+
+def test_profile_records_short_circuits():
+    p = _p_tag()
+    r = p[0]
+    with profile() as profiler:
+        assert is_bold(p) is None
+        assert is_bold(r) is False
+    stats = profiler.stats['is_bold']
+    assert stats.calls == 2
+    assert stats.short_circuits == 1
+    assert stats.short_circuit_rate == 0.5
+
+
+def test_profile_uses_passed_in_profiler():
+    profiler = CallProfiler()
+    with profile(profiler):
+        is_bold(_p_tag())
+    with profile(profiler):
+        is_bold(_p_tag())
+    assert profiler.stats['is_bold'].calls == 2
+    assert 'is_bold' in profiler.report()
+
+
+def test_profile_from_threads():
+    # get_image_id is also called on the PARSE_THREADS threads.
+    profiler = CallProfiler()
+
+    def work():
+        time.sleep(0.01)
+
+    def call():
+        for _ in range(5):
+            profiler.record(work, True, (), {})
+            profiler.record(work, False, (), {})
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = profiler.stats['work']
+    assert stats.calls == 40
+    assert stats.short_circuits == 20
+    # The calls overlap, each thread adds the time of its own calls.
+    assert stats.total_time >= 0.15, stats.total_time
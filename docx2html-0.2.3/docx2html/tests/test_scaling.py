@@ -0,0 +1,96 @@
+"""
+Scaling tests, these convert generated documents of size N, 2N, 4N and 8N
+for each structural feature and fail if the conversion time grows faster
+than linearly. They are slow so they only run when DOCX2HTML_SCALING_TESTS
+is set::
+
+    $ DOCX2HTML_SCALING_TESTS=1 nosetests docx2html.tests.test_scaling
+
+DOCX2HTML_SCALING_BASE changes N.
+"""
+import os
+import shutil
+import tempfile
+import time
+from nose.plugins.skip import SkipTest
+
+from docx2html import convert
+from docx2html.tests.benchmark import build_docx, make_case
+
+SCALING_TESTS = bool(os.environ.get('DOCX2HTML_SCALING_TESTS'))
+BASE_SIZE = int(os.environ.get('DOCX2HTML_SCALING_BASE', 100))
+DOUBLINGS = 3
+REPEAT = 3
+
+# Linear code takes twice as long every time the document doubles, quadratic
+# code four times as long. Leave room for noise and n log n.
+MAX_RATIO_PER_DOUBLING = 2.6
+
+
+def _best_convert_time(case):
+    dp = tempfile.mkdtemp()
+    try:
+        file_path = build_docx(case, os.path.join(dp, 'scaling.docx'))
+        times = []
+        for _ in range(REPEAT):
+            start = time.time()
+            convert(file_path)
+            times.append(time.time() - start)
+    finally:
+        shutil.rmtree(dp)
+    return min(times)
+
+
+def measure_scaling(case_for_size, base_size=BASE_SIZE):
+    """
+    Return the sizes, the conversion times and the average ratio of the time
+    taken per doubling of the size (the geometric mean, so a single noisy
+    measurement in the middle does not matter).
+    """
+    sizes = [base_size * 2 ** i for i in range(DOUBLINGS + 1)]
+    times = [_best_convert_time(case_for_size(size)) for size in sizes]
+    ratio = (times[-1] / times[0]) ** (1.0 / DOUBLINGS)
+    return sizes, times, ratio
+
+
+def _assert_scales_linearly(case_for_size):
+    if not SCALING_TESTS:
+        raise SkipTest('Set DOCX2HTML_SCALING_TESTS to run scaling tests.')
+    sizes, times, ratio = measure_scaling(case_for_size)
+    assert ratio <= MAX_RATIO_PER_DOUBLING, (
+        'Time grows %.2fx per doubling (sizes %s took %s)' % (
+            ratio,
+            sizes,
+            ', '.join('%.3fs' % t for t in times),
+        )
+    )
+
+
+def test_flat_paragraphs_scale_linearly():
+    _assert_scales_linearly(
+        lambda size: make_case('paragraphs', paragraphs=size),
+    )
+
+
+def test_long_lists_scale_linearly():
+    _assert_scales_linearly(
+        lambda size: make_case('lists', list_items=size, list_depth=3),
+    )
+
+
+def test_tall_tables_scale_linearly():
+    _assert_scales_linearly(
+        lambda size: make_case('tables', table_rows=size, table_columns=4),
+    )
+
+
+def test_line_breaks_scale_linearly():
+    _assert_scales_linearly(
+        lambda size: make_case('line_breaks', line_breaks=size),
+    )
+
+
+def test_nested_tables_scale_linearly():
+    _assert_scales_linearly(
+        lambda size: make_case('nested_tables', nested_tables=size),
+    )
@@ -14,9 +14,12 @@ from docx2html.core import (
     get_single_list_nodes_data,
     get_ordered_list_type,
     get_namespace,
+    get_referenced_images,
     get_relationship_info,
     get_style_dict,
     is_last_li,
+    merge_adjacent_runs,
+    scan_document,
 )
 from docx2html.tests.document_builder import DocxBuilder as DXB
 from docx2html.tests import (
@@ -309,6 +312,12 @@ class ImageTestCase(_TranslationTestCase):
         xml = DXB.xml(body)
         return etree.fromstring(xml)
 
+    def test_scan_document(self):
+        tree = self.get_xml()
+        image_sizes, elements = scan_document(tree)
+        self.assertEqual(image_sizes, {'rId0': (4, 4)})
+        self.assertEqual(len(elements), 2)
+
     def test_get_image_id(self):
         tree = self.get_xml()
         els = []
@@ -329,6 +338,25 @@ class ImageTestCase(_TranslationTestCase):
             ]
         )
 
+    def test_get_referenced_images(self):
+        # rId0 is shown twice but only returned once.
+        xml = DXB.xml(DXB.drawing('rId0') + DXB.pict('rId1') + DXB.drawing(
+            'rId0',
+        ))
+        tree = etree.fromstring(xml)
+        images = get_referenced_images(
+            tree,
+            self.relationship_dict,
+            {'rId0': (4, 4)},
+        )
+        self.assertEqual(
+            [tuple(image) for image in images],
+            [
+                ('rId0', 'media/image1.jpeg', (4, 4)),
+                ('rId1', 'media/image2.jpeg', None),
+            ],
+        )
+
     @mock.patch('docx2html.core._get_image_size_from_image')
     def test_missing_size(self, patched_item):
         def side_effect(*args, **kwargs):
@@ -771,6 +799,21 @@ class HeaderFooterTagsWithContent(_TranslationTestCase):
         xml = DXB.xml(body)
         return etree.fromstring(xml)
 
+    def test_scan_document(self):
+        tree = self.get_xml()
+        w_namespace = get_namespace(tree, 'w')
+        image_sizes, elements = scan_document(tree)
+        self.assertEqual(image_sizes, {})
+        # The p tag in the footer is gone along with the sectPr.
+        self.assertEqual(
+            [el.tag for el in elements],
+            ['%sp' % w_namespace],
+        )
+        self.assertEqual(
+            list(tree.iter('%ssectPr' % w_namespace)),
+            [],
+        )
+
 
 class StylesParsingTestCase(_TranslationTestCase):
     expected_output = '<html></html>'
@@ -892,3 +935,33 @@ class RTagWithNoText(_TranslationTestCase):
 
         xml = DXB.xml(body)
         return etree.fromstring(xml)
+
+
+class MergeAdjacentRunsTestCase(_TranslationTestCase):
+    expected_output = """
+    <html>
+        <p><strong>AAABBB</strong>CCCDDD<strong>EEE</strong></p>
+    </html>
+    """
+
+    def get_xml(self):
+        run_tags = [
+            DXB.r_tag('AAA', is_bold=True),
+            DXB.r_tag('BBB', is_bold=True),
+            DXB.r_tag('CCC'),
+            DXB.r_tag('DDD'),
+            DXB.r_tag('EEE', is_bold=True),
+        ]
+        body = DXB.p_tag(run_tags)
+
+        xml = DXB.xml(body)
+        return etree.fromstring(xml)
+
+    def test_merge_adjacent_runs(self):
+        self.assertEqual(
+            merge_adjacent_runs(
+                '<em><strong>a</strong></em><em><strong>b</strong></em>'
+                '<em>c</em><strong>d</strong>'
+            ),
+            '<em><strong>ab</strong>c</em><strong>d</strong>',
+        )
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#冷启动检查：测量 import docx2html 以及每个脚本 --help 的耗时，超出预算则返回 1
+#用法：python importbudget.py [-b 0.3] [-r 5]
+import glob
+import os
+import subprocess
+import sys
+import time
+from optparse import OptionParser
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DOCX2HTML_DIR = os.path.join(HERE, 'docx2html-0.2.3')
+
+
+def scripts():
+    #根目录下所有的转换脚本（不包括本脚本和 test_*.py 测试）
+    names = sorted(glob.glob(os.path.join(HERE, '*.py')))
+    return [n for n in names
+            if os.path.basename(n) != 'importbudget.py'
+            and not os.path.basename(n).startswith('test_')]
+
+
+def measure(args, repeat, env):
+    #取多次运行中最快的一次，返回（耗时，返回码）
+    best = None
+    returncode = 0
+    devnull = open(os.devnull, 'w')
+    try:
+        for _ in range(repeat):
+            start = time.time()
+            returncode = subprocess.call(args, stdout=devnull, stderr=devnull,
+                                         env=env)
+            elapsed = time.time() - start
+            if best is None or elapsed < best:
+                best = elapsed
+    finally:
+        devnull.close()
+    return best, returncode
+
+
+def main():
+    parser = OptionParser(usage='%prog [options]')
+    parser.add_option('-b', '--budget', dest='budget', type='float',
+                      default=0.3,
+                      help='seconds allowed on top of a bare interpreter')
+    parser.add_option('-r', '--repeat', dest='repeat', type='int', default=5)
+    (options, args) = parser.parse_args()
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [DOCX2HTML_DIR] + [p for p in [env.get('PYTHONPATH')] if p])
+
+    baseline, _ = measure([sys.executable, '-c', 'pass'], options.repeat, env)
+    checks = [('import docx2html', [sys.executable, '-c', 'import docx2html'])]
+    for script in scripts():
+        checks.append((os.path.basename(script) + ' --help',
+                       [sys.executable, script, '--help']))
+
+    failed = False
+    print '%-24s %10s %10s' % ('', 'time', 'startup')
+    print '%-24s %9.3fs' % ('python -c pass', baseline)
+    for name, args in checks:
+        elapsed, returncode = measure(args, options.repeat, env)
+        status = 'ok'
+        if returncode != 0:
+            status = 'ERROR (exit %d)' % returncode
+            failed = True
+        elif elapsed - baseline > options.budget:
+            status = 'OVER BUDGET'
+            failed = True
+        print '%-24s %9.3fs %9.3fs  %s' % (name, elapsed, elapsed - baseline,
+                                            status)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,55 +2,178 @@
 # -*- coding: utf-8 -*-
 # Created by xiaoqin00 on 2017/6/22
 
+import errno
 import sys
-from pdfminer.pdfinterp import PDFResourceManager,PDFPageInterpreter
-from pdfminer.converter import TextConverter
-from pdfminer.layout import LAParams
-from pdfminer.pdfpage import PDFPage
 from optparse import OptionParser
-#main
-def convert(argv) :
-    #输出文件名，这里只处理单文档，所以只用了argv［1］
-    outfile = argv[1] + '.txt'
-    args = [argv[1]]
 
-    debug = 0
-    pagenos = set()
-    password = ''
-    maxpages = 0
-    rotation = 0
-    codec = 'utf-8'   #输出编码
-    caching = True
-    imagewriter = None
+#并行转换时每个进程分到的页组数，页组小一些各进程的负载更均匀
+CHUNKS_PER_PROCESS = 4
+
+debug = 0
+password = ''
+rotation = 0
+codec = 'utf-8'   #输出编码
+caching = True
+imagewriter = None
+
+#子进程里打开的 pdf：文件名 ->（所有页，资源管理器）
+#同一个进程转换多组页时 pdf 只解析一次，字体也只加载一次
+_opened = {}
+
+def get_pages(fp):
+    #pdfminer 导入较慢，只在真正转换时导入
+    from pdfminer.pdfpage import PDFPage
+    return PDFPage.get_pages(fp, password=password,
+                          caching=caching, check_extractable=True)
+
+def select_pages(pages, pagenos=None, maxpages=0):
+    #从 pages 里按顺序取出要转换的页，返回（页码，页）；串行和并行都用它选页
+    #pagenos（从 0 开始的页码）为空时是所有页，maxpages 不为 0 时只看前 maxpages 页
+    #两个都给时取交集，比如 --pages 5 --max-pages 2 没有要转换的页
+    last = max(pagenos) if pagenos else None
+    for pageno, page in enumerate(pages):
+        #后面没有要的页了，不用再读页面树
+        if maxpages and pageno >= maxpages:
+            return
+        if last is not None and pageno > last:
+            return
+        if not pagenos or pageno in pagenos:
+            yield pageno, page
+
+def process_pages(pages, outfp, rsrcmgr=None, flush=False):
+    #把 pages 的文字按顺序写到 outfp，flush 为真时每页写完都 flush，读的一方马上就能拿到
+    from pdfminer.pdfinterp import PDFResourceManager,PDFPageInterpreter
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
     laparams = LAParams()
     #
     PDFResourceManager.debug = debug
     PDFPageInterpreter.debug = debug
 
-    rsrcmgr = PDFResourceManager(caching=caching)
-    outfp = file(outfile,'w')
+    if rsrcmgr is None:
+        rsrcmgr = PDFResourceManager(caching=caching)
 #pdf转换
     device = TextConverter(rsrcmgr, outfp, codec=codec, laparams=laparams,
                 imagewriter=imagewriter)
-
-    for fname in args:
-        fp = file(fname,'rb')
-        interpreter = PDFPageInterpreter(rsrcmgr, device)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
 #处理文档对象中每一页的内容
-        for page in PDFPage.get_pages(fp, pagenos,
-                          maxpages=maxpages, password=password,
-                          caching=caching, check_extractable=True) :
-            page.rotate = (page.rotate+rotation) % 360
-            interpreter.process_page(page)
-        fp.close()
+    for page in pages:
+        page.rotate = (page.rotate+rotation) % 360
+        interpreter.process_page(page)
+        if flush:
+            outfp.flush()
     device.close()
-    outfp.close()
+
+def extract(input, outfp, pagenos=None, maxpages=0, flush=False):
+    #把 input 中 select_pages 选出的页的文字写到 outfp
+    fp = file(input,'rb')
+    try:
+        pages = select_pages(get_pages(fp), pagenos, maxpages)
+        process_pages((page for _, page in pages), outfp, flush=flush)
+    finally:
+        fp.close()
+
+def list_pages(input, pagenos=None, maxpages=0):
+    #select_pages 选出的页码，只读页面树，不解析页面内容
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    fp = file(input,'rb')
+    try:
+        doc = PDFDocument(PDFParser(fp))
+        return [pageno for pageno, _ in
+                select_pages(PDFPage.create_pages(doc), pagenos, maxpages)]
+    finally:
+        fp.close()
+
+def extract_chunk(args):
+    #在子进程里转换一组页，返回这些页的文字
+    from cStringIO import StringIO
+    from pdfminer.pdfinterp import PDFResourceManager
+    input, pagenos = args
+    if input not in _opened:
+        _opened.clear()
+        #页的内容在处理时才从文件读取，文件在进程结束时关闭
+        fp = file(input,'rb')
+        _opened[input] = (list(get_pages(fp)),
+                          PDFResourceManager(caching=caching))
+    pages, rsrcmgr = _opened[input]
+    outfp = StringIO()
+    process_pages([pages[pageno] for pageno in pagenos], outfp, rsrcmgr)
+    return outfp.getvalue()
+
+def chunks(pagenos, processes):
+    #把页码按顺序分成几组，组数是进程数的 CHUNKS_PER_PROCESS 倍
+    size = max(1, -(-len(pagenos) // (processes * CHUNKS_PER_PROCESS)))
+    return [pagenos[start:start + size]
+            for start in range(0, len(pagenos), size)]
+
+def parse_pages(pages):
+    #把 "1,3,5-10"（从 1 开始）转成从 0 开始的页码集合
+    pagenos = set()
+    for part in pages.split(','):
+        first, _, last = part.strip().partition('-')
+        first = int(first)
+        last = int(last) if last else first
+        if first < 1 or last < first:
+            raise ValueError('invalid page range: %s' % part)
+        pagenos.update(range(first - 1, last))
+    return pagenos
+
+#main
+def convert(input, output=None, processes=1, pagenos=None, maxpages=0) :
+    #输出文件名，没有指定时在输入文件名后加 .txt，为 - 时写到标准输出
+    #文字一页（并行时一组页）写一次，写完就 flush
+    outfile = output or input + '.txt'
+    if outfile == '-':
+        outfp = sys.stdout
+    else:
+        outfp = file(outfile,'w')
+    try:
+        if processes <= 1:
+            extract(input, outfp, pagenos, maxpages, flush=True)
+            return
+        #每个进程各自打开 pdf 转换分到的页，结果按页的顺序写入
+        selected = list_pages(input, pagenos, maxpages)
+        import multiprocessing
+        pool = multiprocessing.Pool(processes=processes)
+        try:
+            jobs = [(input, chunk) for chunk in chunks(selected, processes)]
+            for text in pool.imap(extract_chunk, jobs):
+                outfp.write(text)
+                outfp.flush()
+        finally:
+            pool.terminate()
+    finally:
+        if outfp is not sys.stdout:
+            outfp.close()
     return
 
 if __name__ == '__main__':
     parser=OptionParser(usage='%prog [options]')
     parser.add_option('-i','--in',dest='input',help='input file')
-    parser.add_option('-o','--out',dest='output',help='output file')
+    parser.add_option('-o','--out',dest='output',
+                      help='output file, - for stdout [default: input.txt]')
+    parser.add_option('-j','--jobs',dest='jobs',type='int',default=1,
+                      help='worker processes, each converts part of the pages')
+    parser.add_option('--pages',dest='pages',
+                      help='pages to convert, like 1,3,5-10')
+    parser.add_option('--max-pages',dest='maxpages',type='int',default=0,
+                      help='only convert within the first pages')
     (options,args)=parser.parse_args()
+    if not options.input:
+        parser.error('no input file')
+    pagenos = None
+    if options.pages:
+        try:
+            pagenos = parse_pages(options.pages)
+        except ValueError as e:
+            parser.error(str(e))
     # print options.input
-    convert()
\ No newline at end of file
+    try:
+        convert(options.input, options.output, options.jobs, pagenos,
+                options.maxpages)
+    except IOError as e:
+        #读的一方提前关闭了管道（比如 | head），不算出错
+        if e.errno != errno.EPIPE:
+            raise
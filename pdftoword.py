@@ -4,21 +4,22 @@
 
 #pdf 转为word,没有找到pdf直接转换为word的方法，就先转为txt，然后转换为word
 
+import os
 import sys
-from pdfminer.pdfinterp import PDFResourceManager,PDFPageInterpreter
-from pdfminer.converter import TextConverter
-from pdfminer.layout import LAParams
-from pdfminer.pdfpage import PDFPage
-
+import tempfile
 from optparse import OptionParser
-from docx import Document
-from docx.shared import Inches
 
 #main
-def pdftotxt():
-    #输出文件名，这里只处理单文档，所以只用了argv［1］
-    outfile = options.input + '.txt'
-    args = [options.input]
+def pdftotxt(input, outfile=None):
+    #pdfminer 导入较慢，只在真正转换时导入
+    from pdfminer.pdfinterp import PDFResourceManager,PDFPageInterpreter
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfpage import PDFPage
+    #输出文件名，没有指定时在输入文件名后加 .txt
+    #这里只处理单文档，所以只用了argv［1］
+    outfile = outfile or input + '.txt'
+    args = [input]
 
     debug = 0
     pagenos = set()
@@ -53,7 +54,8 @@ def pdftotxt():
     outfp.close()
     return
 
-def txttoword():
+def txttoword(input, output=None, txtfile=None):
+    from docx import Document
     #创建 Document 对象，相当于打开一个 word 文档
     document = Document()
 
@@ -63,10 +65,8 @@ def txttoword():
     #向文档中添加一个段落，并将段落引用赋给变量 p
     #使用 add_run 方法追加字段，并设置格式
     # f=open('test.pdf.txt','r')
-    f=open(options.input+'.txt','r')
+    f=open(txtfile or input+'.txt','r')
     for i in f.readlines():
-        print i
-        print 'test'
         i=str(i)
         i=i.split()
         if not i:
@@ -95,16 +95,23 @@ def txttoword():
     # table.cell(1,1).text = "cell_11"
 
     #保存文本
-    if options.output:
-        document.save(options.output)
-    document.save(options.input+'.docx')
+    document.save(output or input+'.docx')
     return
 
+def convert(input, output=None):
+    #中间的txt文件用临时文件，不写到输入文件旁边，转换完或出错时都删除
+    fd, tmpname = tempfile.mkstemp(suffix='.txt')
+    os.close(fd)
+    try:
+        pdftotxt(input, tmpname)
+        txttoword(input, output, tmpname)
+    finally:
+        os.remove(tmpname)
+
 if __name__ == '__main__':
     parser=OptionParser(usage='%prog [options]')
     parser.add_option('-i','--in',dest='input',help='input file')
     parser.add_option('-o','--out',dest='output',help='output file')
     (options,args)=parser.parse_args()
     # print options.input
-    pdftotxt()
-    txttoword()
\ No newline at end of file
+    convert(options.input, options.output)
\ No newline at end of file
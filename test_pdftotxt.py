@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#pdftotxt 的测试：python -m nose test_pdftotxt
+import os
+import re
+import shutil
+import tempfile
+from unittest import TestCase
+
+import pdftotxt
+
+
+def make_pdf(path, pages):
+    #写一个 pages 页的 pdf，第 n 页只有一行 "Page n"
+    objects = ['<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    parent = 2 * pages + 2
+    kids = []
+    for pageno in range(1, pages + 1):
+        text = 'BT /F1 12 Tf 72 720 Td (Page %d) Tj ET' % pageno
+        objects.append('<< /Length %d >>\nstream\n%s\nendstream' % (
+            len(text), text))
+        objects.append(
+            '<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] '
+            '/Resources << /Font << /F1 1 0 R >> >> /Contents %d 0 R >>' % (
+                parent, len(objects)))
+        kids.append('%d 0 R' % len(objects))
+    objects.append('<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        ' '.join(kids), pages))
+    objects.append('<< /Type /Catalog /Pages %d 0 R >>' % parent)
+    data = '%PDF-1.4\n'
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += '%d 0 obj\n%s\nendobj\n' % (number, obj)
+    xref = len(data)
+    data += 'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        data += '%010d 00000 n \n' % offset
+    data += 'trailer\n<< /Size %d /Root %d 0 R >>\n' % (
+        len(objects) + 1, len(objects))
+    data += 'startxref\n%d\n%%%%EOF\n' % xref
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+class PdfToTxtTestCase(TestCase):
+    def setUp(self):
+        self.dp = tempfile.mkdtemp()
+        self.pdf = os.path.join(self.dp, 'pages.pdf')
+        make_pdf(self.pdf, 8)
+
+    def tearDown(self):
+        shutil.rmtree(self.dp)
+
+    def convert(self, processes, pagenos=None, maxpages=0):
+        output = os.path.join(self.dp, 'pages.%d.txt' % processes)
+        pdftotxt.convert(self.pdf, output, processes, pagenos, maxpages)
+        with open(output) as f:
+            text = f.read()
+        #每页之间有换页符
+        return [int(pageno) for pageno in re.findall(r'Page (\d+)', text)]
+
+    def test_select_pages(self):
+        pages = 'abcdefgh'
+        for pagenos, maxpages, expected in (
+                (None, 0, 'abcdefgh'),
+                (None, 3, 'abc'),
+                (set([1, 4]), 0, 'be'),
+                (set([1, 4]), 3, 'b'),
+                (set([4]), 2, '')):
+            selected = pdftotxt.select_pages(pages, pagenos, maxpages)
+            assert ''.join(page for _, page in selected) == expected
+
+    def test_serial_and_parallel(self):
+        #-j 和串行转换选出的页一样，--pages 和 --max-pages 一起给时取交集
+        for pages, maxpages, expected in (
+                (None, 0, [1, 2, 3, 4, 5, 6, 7, 8]),
+                (None, 3, [1, 2, 3]),
+                ('2,5-6', 0, [2, 5, 6]),
+                ('2,5-6', 5, [2, 5]),
+                ('5', 2, []),
+                ('7-20', 0, [7, 8])):
+            pagenos = pages and pdftotxt.parse_pages(pages)
+            serial = self.convert(1, pagenos, maxpages)
+            parallel = self.convert(2, pagenos, maxpages)
+            assert serial == parallel == expected, (
+                pages, maxpages, serial, parallel)
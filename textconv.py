@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#统一的转换入口：根据源格式和目标格式选择转换脚本，一次转换多个文件
+#输入可以是文件、目录（会递归查找）、通配符，或用 -l 给出的文件列表（- 表示标准输入）
+#用法：python textconv.py -t txt [-j 4] [-o outdir] [-l list] 文件/目录/通配符 ...
+import glob
+import os
+import sys
+import time
+from optparse import OptionParser
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DOCX2HTML_DIR = os.path.join(HERE, 'docx2html-0.2.3')
+
+#扩展名对应的格式
+FORMATS = {
+    '.pdf': 'pdf',
+    '.txt': 'txt',
+    '.xls': 'xls',
+    '.xlsx': 'xls',
+    '.doc': 'doc',
+    '.docx': 'docx',
+    '.html': 'html',
+    '.htm': 'html',
+}
+
+#（源格式，目标格式）对应的转换函数，“模块:函数”，在转换时才导入
+#没有模块名的是本脚本里的函数；函数的参数都是（输入文件，输出文件）
+CONVERTERS = {
+    ('pdf', 'txt'): 'pdftotxt:convert',
+    ('pdf', 'docx'): 'pdftoword:convert',
+    ('txt', 'docx'): 'txttoword:convert',
+    ('txt', 'xls'): 'txttoxls:txt2xls',
+    ('xls', 'txt'): 'xlstotxt:convert',
+    ('xls', 'docx'): 'xlstodoc:convert',
+    ('xls', 'pdf'): 'xlstopdf:convert',
+    ('doc', 'pdf'): 'doctopdf:convert',
+    ('docx', 'pdf'): 'doctopdf:convert',
+    ('doc', 'html'): 'wordtohtml:wordsToHtml',
+    ('docx', 'html'): 'docxtohtml',
+}
+
+TARGETS = sorted(set(target for _, target in CONVERTERS))
+
+
+def docxtohtml(input, output):
+    #docx 转 html 用仓库里的 docx2html，不需要 Word，边生成边写入
+    if DOCX2HTML_DIR not in sys.path:
+        sys.path.append(DOCX2HTML_DIR)
+    from docx2html.core import iter_html
+    with open(output, 'wb') as f:
+        for chunk in iter_html(input):
+            f.write(chunk)
+
+
+def get_format(path, source=None):
+    if source:
+        return source
+    return FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def get_converter(name):
+    if ':' not in name:
+        return globals()[name]
+    module, function = name.split(':')
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    __import__(module)
+    return getattr(sys.modules[module], function)
+
+
+def collect(paths, listfile=None):
+    #把目录、通配符和文件列表展开成文件，返回（文件，所在的输入目录）
+    #不是从目录里找到的文件，输入目录为 None
+    found = []
+    if listfile:
+        f = sys.stdin if listfile == '-' else open(listfile)
+        try:
+            found.extend((line.strip(), None) for line in f if line.strip())
+        finally:
+            if f is not sys.stdin:
+                f.close()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    found.append((os.path.join(root, name), path))
+        elif os.path.exists(path):
+            found.append((path, None))
+        else:
+            #没有匹配的通配符当作文件，转换时报告不存在
+            matches = sorted(glob.glob(path))
+            found.extend((match, None) for match in matches or [path])
+    return found
+
+
+def make_jobs(found, target, outdir=None, source=None):
+    #每个文件一个任务（输入，输出，转换函数）；目录里没有对应转换的文件跳过
+    #有 outdir 时，目录里的文件保留在输入目录下的相对路径
+    #两个文件的输出相同时（比如 a/x.pdf 和 b/x.pdf 都输出到 outdir/x.txt）
+    #抛出 ValueError，不让后转换的覆盖先转换的
+    jobs = []
+    seen = set()
+    outputs = {}
+    for path, top in found:
+        if path in seen:
+            continue
+        seen.add(path)
+        converter = CONVERTERS.get((get_format(path, source), target))
+        if converter is None and top is not None:
+            continue
+        base = os.path.splitext(path)[0]
+        if outdir:
+            if top is not None:
+                base = os.path.join(outdir, os.path.relpath(base, top))
+            else:
+                base = os.path.join(outdir, os.path.basename(base))
+        output = base + '.' + target
+        key = os.path.normcase(os.path.abspath(output))
+        if key in outputs:
+            raise ValueError('%s and %s would both be converted to %s' % (
+                outputs[key], path, output))
+        outputs[key] = path
+        jobs.append((path, output, converter))
+    return jobs
+
+
+def run(job):
+    #转换一个文件（在进程池的子进程里运行），返回（输入，输出，字节数，耗时，错误）
+    input, output, converter = job
+    start = time.time()
+    size = 0
+    error = None
+    try:
+        size = os.path.getsize(input)
+        if converter is None:
+            raise ValueError('no converter for this format')
+        get_converter(converter)(input, output)
+        #有的脚本出错时只打印不抛异常，以输出文件为准
+        if not os.path.exists(output):
+            raise IOError('no output was written')
+    except Exception as e:
+        error = '%s: %s' % (e.__class__.__name__, e)
+    return input, output, size, time.time() - start, error
+
+
+def convert_all(jobs, processes):
+    #进程池里转换，按完成的顺序返回结果；只有一个进程时在本进程里转换
+    if processes <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield run(job)
+        return
+    import multiprocessing
+    pool = multiprocessing.Pool(processes=processes)
+    try:
+        for result in pool.imap_unordered(run, jobs):
+            yield result
+    finally:
+        pool.terminate()
+
+
+def main():
+    parser = OptionParser(
+        usage='%prog -t FORMAT [options] FILE|DIR|GLOB ...')
+    parser.add_option('-t', '--to', dest='target',
+                      help='target format: ' + ', '.join(TARGETS))
+    parser.add_option('-f', '--from', dest='source',
+                      help='source format, instead of the file extension')
+    parser.add_option('-o', '--out', dest='outdir',
+                      help='output directory [default: next to the input]')
+    parser.add_option('-l', '--list', dest='listfile',
+                      help='file with one input file per line, - for stdin')
+    parser.add_option('-j', '--jobs', dest='jobs', type='int',
+                      help='worker processes [default: number of cpus]')
+    parser.add_option('-v', '--verbose', dest='verbose',
+                      action='store_true', default=False,
+                      help='print every converted file')
+    (options, args) = parser.parse_args()
+    if options.target not in TARGETS:
+        parser.error('-t must be one of: ' + ', '.join(TARGETS))
+    if not args and not options.listfile:
+        parser.error('no input files')
+
+    processes = options.jobs
+    if not processes:
+        import multiprocessing
+        processes = multiprocessing.cpu_count()
+
+    try:
+        jobs = make_jobs(collect(args, options.listfile), options.target,
+                         options.outdir, options.source)
+    except ValueError as e:
+        parser.error(str(e))
+    if options.outdir:
+        #输出目录（包括输入目录里的子目录）在转换前建好
+        for _, output, _ in jobs:
+            directory = os.path.dirname(output)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+    start = time.time()
+    done = failed = 0
+    total_bytes = 0
+    busy = 0.0
+    for input, output, size, elapsed, error in convert_all(jobs, processes):
+        busy += elapsed
+        if error:
+            failed += 1
+            sys.stderr.write('FAILED %s: %s\n' % (input, error))
+            continue
+        done += 1
+        total_bytes += size
+        if options.verbose:
+            print '%s -> %s (%.3fs)' % (input, output, elapsed)
+    wall = time.time() - start
+
+    #吞吐量汇总
+    megabytes = total_bytes / 1024.0 / 1024.0
+    print '%d converted, %d failed, %.1f MB in %.2fs with %d processes' % (
+        done, failed, megabytes, wall, processes)
+    if wall > 0:
+        print '%.1f files/s, %.2f MB/s, %.1fx parallel' % (
+            (done + failed) / wall, megabytes / wall, busy / wall)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,9 +3,9 @@
 # Created by xiaoqin00 on 2017/6/26
 
 from optparse import OptionParser
-from docx import Document
-from docx.shared import Inches
-def convert():
+def convert(input, output):
+    #python-docx 只在真正转换时导入
+    from docx import Document
     #创建 Document 对象，相当于打开一个 word 文档
     document = Document()
 
@@ -15,10 +15,8 @@ def convert():
     #向文档中添加一个段落，并将段落引用赋给变量 p
     #使用 add_run 方法追加字段，并设置格式
     # f=open('test.pdf.txt','r')
-    f=open(str(options.input),'r')
+    f=open(str(input),'r')
     for i in f.readlines():
-        print i
-        print 'test'
         i=str(i)
         i=i.split()
         if not i:
@@ -47,8 +45,6 @@ def convert():
     # table.cell(1,1).text = "cell_11"
 
     #保存文本
-    if options.output:
-        document.save(options.output)
     document.save(str(output))
     return
 
@@ -57,6 +53,4 @@ if __name__ == '__main__':
     parser.add_option('-i','--in',dest='input',help='input file')
     parser.add_option('-o','--out',dest='output',help='output file')
     (options,args)=parser.parse_args()
-    input=options.input
-    output=options.output
-    convert()
\ No newline at end of file
+    convert(options.input, options.output)
\ No newline at end of file
@@ -5,10 +5,10 @@ import datetime
 import time
 import os
 import sys
-import xlwt #需要的模块
 from optparse import OptionParser
 
 def txt2xls(filename,xlsname):  #文本转换成xls的函数，filename 表示一个要被转换的txt文本，xlsname 表示转换后的文件名
+    import xlwt #需要的模块，只在真正转换时导入
     print 'converting xls ... '
     f = open(filename)   #打开txt文本进行读取
     x = 0                #在excel开始写的位置（y）
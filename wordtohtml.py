@@ -3,14 +3,14 @@
 # Created by xiaoqin00 on 2017/7/11
 
 
-from win32com import client as wc
 import os
 from optparse import OptionParser
 
-word = wc.Dispatch('Word.Application')
-
 
 def wordsToHtml(input,output):
+    #只在真正转换时才启动 Word，导入模块时不启动
+    from win32com import client as wc
+    word = wc.Dispatch('Word.Application')
     # for path, subdirs, files in os.walk(dir):
     #     for wordFile in files:
     # wordFullName = os.path.join(path, wordFile)
@@ -1,28 +1,37 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # Created by xiaoqin00 on 2017/7/10
-import xlrd
+import os
+import tempfile
 from optparse import OptionParser
 
-def convert():
+def convert(input, output):
+    #临时txt文件，每次转换单独一个，多个进程同时转换时不会互相覆盖
+    #转换出错时也删除
+    fd, tmpname = tempfile.mkstemp(suffix='.txt')
+    os.close(fd)
     try:
-        data = xlrd.open_workbook(input)
-        table = data.sheets()[0]
-        nrows = table.nrows
-        ncols=table.ncols
-        # print nrows, type(nrows)
-        f = open('tmp.txt', 'w')   #临时txt文件
-        for i in range(nrows):
-            tmp=''
-            for j in range(ncols):
-                print table.cell(i,j)
-                tmp = tmp + str(table.cell(i, j)).split(':')[1] +' '
-            f.write(tmp + '\n')
-        f.close()
-    except Exception,e:
-        print e
+        convert_via(input, output, tmpname)
+    finally:
+        os.remove(tmpname)
+
+def convert_via(input, output, tmpname):
+    #经过临时txt文件 tmpname 把 input 转换成 output
+    import xlrd #只在真正转换时导入
+    #读不了的 xls 直接抛出异常，不生成空的 docx，批量转换时算作失败
+    data = xlrd.open_workbook(input)
+    table = data.sheets()[0]
+    nrows = table.nrows
+    ncols=table.ncols
+    # print nrows, type(nrows)
+    f = open(tmpname, 'w')
+    for i in range(nrows):
+        tmp=''
+        for j in range(ncols):
+            tmp = tmp + str(table.cell(i, j)).split(':')[1] +' '
+        f.write(tmp + '\n')
+    f.close()
     from docx import Document
-    from docx.shared import Inches
 
     # 创建 Document 对象，相当于打开一个 word 文档
     document = Document()
@@ -33,10 +42,8 @@ def convert():
     # 向文档中添加一个段落，并将段落引用赋给变量 p
     # 使用 add_run 方法追加字段，并设置格式
     # f=open('test.pdf.txt','r')
-    f = open('tmp.txt', 'r')
+    f = open(tmpname, 'r')
     for i in f.readlines():
-     print i
-     print 'test'
      i = str(i)
      i = i.split()
      if not i:
@@ -64,9 +71,9 @@ def convert():
     # table.cell(1,0).text = "cell_10"
     # table.cell(1,1).text = "cell_11"
 
+    f.close()
+
     # 保存文本
-    if options.output:
-     document.save(options.output)
     document.save(str(output))
     return
 
@@ -75,6 +82,4 @@ if __name__ == '__main__':
     parser.add_option('-i','--in',dest='input',help='input file')
     parser.add_option('-o','--out',dest='output',help='output file')
     (options,args)=parser.parse_args()
-    input=options.input
-    output=options.output
-    convert()
\ No newline at end of file
+    convert(options.input, options.output)
\ No newline at end of file
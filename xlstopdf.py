@@ -2,14 +2,14 @@
 # -*- coding: utf-8 -*-
 # Created by xiaoqin00 on 2017/6/26
 
-from win32com import client
 import os
 from optparse import OptionParser
 
-def convert():
+def convert(input, output):
+    from win32com import client #只在真正转换时导入
     xlApp = client.Dispatch("Excel.Application")
-    input=os.path.abspath(options.input)
-    output=os.path.abspath(options.output)
+    input=os.path.abspath(input)
+    output=os.path.abspath(output)
     books = xlApp.Workbooks.Open(input)
     ws = books.Worksheets[0]
     ws.Visible = 1
@@ -20,4 +20,4 @@ if __name__ == '__main__':
   parser.add_option('-i', '--in', dest='input', help='input file')
   parser.add_option('-o', '--out', dest='output', help='output file')
   (options, args) = parser.parse_args()
-  convert()
\ No newline at end of file
+  convert(options.input, options.output)
\ No newline at end of file
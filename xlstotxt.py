@@ -2,22 +2,20 @@
 # -*- coding: utf-8 -*-
 # Created by xiaoqin00 on 2017/7/10
 
-import xlrd
 from optparse import OptionParser
 
-def convert():
+def convert(input, output):
+    import xlrd #只在真正转换时导入
     try:
         data = xlrd.open_workbook(input)
         table = data.sheets()[0]
         nrows = table.nrows
         ncols=table.ncols
-        print nrows, type(nrows)
         f = open(output, 'w')
 
         for i in range(nrows):
             tmp=''
             for j in range(ncols):
-                print table.cell(i,j)
                 tmp = tmp + str(table.cell(i, j)).split(':')[1] + ' '
             f.write(tmp + '\n')
         f.close()
@@ -29,6 +27,4 @@ if __name__ == '__main__':
     parser.add_option('-i','--in',dest='input',help='input file')
     parser.add_option('-o','--out',dest='output',help='output file')
     (options,args)=parser.parse_args()
-    input=options.input
-    output=options.output
-    convert()
\ No newline at end of file
+    convert(options.input, options.output)
\ No newline at end of file